@@ -14,3 +14,26 @@ class DebugCog(commands.Cog):
 async def ping(interaction: discord.Interaction) -> None:
     latency = round(interaction.client.latency * 1000)  # Convert to milliseconds
     await interaction.response.send_message(f"Pong! Latency: {latency}ms", ephemeral=True)
+
+
+@debug_group.command(name="drift", description="Show command drift scan statistics.")
+async def drift(interaction: discord.Interaction) -> None:
+    guild_sync_cog = interaction.client.get_cog("GuildSyncCog")
+    detector = getattr(guild_sync_cog, "drift_detector", None)
+    if detector is None:
+        await interaction.response.send_message("Guild sync is not loaded.", ephemeral=True)
+        return
+
+    stats = detector.stats
+    last_pass = f"{stats.last_pass_seconds:.0f}s" if stats.last_pass_seconds is not None else "not finished yet"
+    last_scan = f"<t:{int(stats.last_scan_at)}:R>" if stats.last_scan_at is not None else "never"
+    lines = [
+        f"Current pass: {stats.pass_scanned}/{stats.pass_size} guilds ({stats.coverage:.0%} coverage)",
+        f"Completed passes: {stats.passes} (last took {last_pass}), last scan {last_scan}",
+        f"Scans: {stats.scans} | in sync: {stats.in_sync} | drifted: {stats.drifted} | missing: {stats.missing} | errors: {stats.errors}",
+        f"Resyncs queued: {stats.resyncs_queued}",
+    ]
+    if stats.recent_drift:
+        recent = ", ".join(f"{guild_id} ({status})" for guild_id, status in list(stats.recent_drift.items())[:10])
+        lines.append(f"Out of sync this pass: {recent}")
+    await interaction.response.send_message("\n".join(lines), ephemeral=True)
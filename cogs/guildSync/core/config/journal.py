@@ -0,0 +1,139 @@
+import json
+import os
+from contextlib import suppress
+from typing import IO, Any, Dict, Iterable, List, Optional
+
+
+class MutationJournal:
+    """Append-only JSON-lines log of config mutations.
+
+    Each change costs one short line instead of a full snapshot rewrite. The
+    snapshots are brought up to date by compaction, after which the journal
+    starts over empty.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.compacting_path = f"{path}.compacting"
+        # Entries rotated while an earlier compaction's file was still waiting.
+        self.rotated_path = f"{path}.rotated"
+        self._file: Optional[IO[str]] = None
+        self._entries = 0
+        self._unsynced = False
+
+    def __len__(self) -> int:
+        return self._entries
+
+    def _read_file(self, path: str) -> List[Dict[str, Any]]:
+        if not os.path.exists(path):
+            return []
+
+        entries: List[Dict[str, Any]] = []
+        with open(path, "r", encoding="utf-8") as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-append can leave one torn trailing line; nothing after it is trusted.
+                    break
+                if isinstance(entry, dict):
+                    entries.append(entry)
+        return entries
+
+    def read(self) -> List[Dict[str, Any]]:
+        """Return entries left by interrupted compactions followed by the live journal."""
+        entries = (
+            self._read_file(self.compacting_path)
+            + self._read_file(self.rotated_path)
+            + self._read_file(self.path)
+        )
+        self._entries = len(entries)
+        return entries
+
+    def _handle(self) -> IO[str]:
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def append(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Append entries and hand them to the OS; durability comes from ``sync``."""
+        lines = "".join(json.dumps(entry, separators=(",", ":")) + "\n" for entry in entries)
+        if not lines:
+            return
+
+        file = self._handle()
+        file.write(lines)
+        file.flush()
+        self._entries += lines.count("\n")
+        self._unsynced = True
+
+    def sync(self) -> None:
+        file = self._file
+        if file is None or not self._unsynced:
+            return
+
+        self._unsynced = False
+        with suppress(OSError, ValueError):
+            os.fsync(file.fileno())
+
+    def rotate(self) -> Optional[IO[str]]:
+        """Move the live journal aside for compaction and start a fresh one.
+
+        Only renames on the event loop. Returns the previous handle so the
+        caller can fsync and close it off the loop in ``fold_rotated``.
+        """
+        if os.path.exists(self.path):
+            if not os.path.exists(self.compacting_path):
+                target = self.compacting_path
+            elif not os.path.exists(self.rotated_path):
+                # An earlier compaction failed; ``fold_rotated`` appends these to its entries.
+                target = self.rotated_path
+            else:
+                # Folding failed too. Keep appending here: every entry carries its
+                # full value, so replaying these over the new snapshot is harmless.
+                return None
+            os.replace(self.path, target)
+
+        previous = self._file
+        self._file = None
+        self._entries = 0
+        self._unsynced = False
+        return previous
+
+    def fold_rotated(self, previous: Optional[IO[str]]) -> None:
+        """Close the rotated handle and append any parked entries to the compacting file."""
+        if previous is not None:
+            with suppress(OSError, ValueError):
+                previous.flush()
+                os.fsync(previous.fileno())
+            previous.close()
+        if not os.path.exists(self.rotated_path):
+            return
+
+        with open(self.rotated_path, "rb") as source:
+            data = source.read()
+        with open(self.compacting_path, "ab+") as target:
+            target.seek(0, os.SEEK_END)
+            if target.tell():
+                # A torn last line must not swallow the first appended entry.
+                target.seek(-1, os.SEEK_END)
+                if target.read(1) != b"\n":
+                    target.write(b"\n")
+            target.write(data)
+            target.flush()
+            os.fsync(target.fileno())
+        os.remove(self.rotated_path)
+
+    def finish_compaction(self) -> None:
+        for path in (self.compacting_path, self.rotated_path):
+            with suppress(FileNotFoundError):
+                os.remove(path)
+
+    def close(self) -> None:
+        self.sync()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
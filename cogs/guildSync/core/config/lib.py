@@ -1,16 +1,54 @@
+import asyncio
+import copy
 import json
 import os
-from typing import Any, Dict, Iterable, Optional, Set
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from interface.logger import Logger
+
+from .store import ConfigSnapshot, ConfigStore, JsonConfigStore, SqliteConfigStore
 
 
 CONFIG_DIR = os.path.join(os.path.dirname(__file__), "data")
 GUILDS_FILE = os.path.join(CONFIG_DIR, "guilds.json")
 COMMANDS_FILE = os.path.join(CONFIG_DIR, "commands.json")
 UNMANAGED_FILE = os.path.join(CONFIG_DIR, "unmanaged.json")
+SYNC_HASHES_FILE = os.path.join(CONFIG_DIR, "sync_hashes.json")
+SETTINGS_FILE = os.path.join(CONFIG_DIR, "settings.json")
+UNREACHABLE_FILE = os.path.join(CONFIG_DIR, "unreachable.json")
+INVITES_FILE = os.path.join(CONFIG_DIR, "invites.json")
+JOURNAL_FILE = os.path.join(CONFIG_DIR, "journal.jsonl")
+DATABASE_FILE = os.path.join(CONFIG_DIR, "guildsync.sqlite3")
 
 _GUILDS_DEFAULT: Dict[str, int] = {}
 _COMMANDS_DEFAULT: Dict[str, Any] = {"commands": {}}
 _UNMANAGED_DEFAULT: Dict[str, Any] = {"suppressed": []}
+_SYNC_HASHES_DEFAULT: Dict[str, Any] = {"guilds": {}}
+_UNREACHABLE_DEFAULT: Dict[str, Any] = {"guilds": {}}
+_INVITES_DEFAULT: Dict[str, Any] = {"invites": {}}
+_SETTINGS_DEFAULT: Dict[str, Any] = {
+    "sync_workers": 4,
+    "hybrid_registration": False,
+    "sync_debounce_seconds": 2.0,
+    "sync_max_delay_seconds": 10.0,
+    "journal_fsync_interval_seconds": 1.0,
+    "journal_compact_interval_seconds": 300.0,
+    "journal_compact_threshold": 500,
+    "storage_backend": "json",
+    "config_watch_interval_seconds": 2.0,
+    "resolve_workers": 8,
+    "unreachable_guild_ttl_seconds": 21600.0,
+    "invite_rate_per_minute": 6.0,
+    "invite_burst": 3,
+    "stateless_dispatch": False,
+    "sync_reconcile": False,
+    "drift_scan_requests_per_minute": 30.0,
+    "drift_scan_jitter": 0.5,
+}
 
 
 def _ensure_config_dir() -> None:
@@ -33,6 +71,35 @@ def _load_json(path: str, default: Any) -> Any:
     return json.loads(json.dumps(default))
 
 
+def _write_text_atomic(
+    path: str,
+    text: str,
+    before_replace: Optional[Callable[[str], None]] = None,
+) -> None:
+    """Write ``text`` to a temp file beside ``path`` and rename it into place.
+
+    ``before_replace`` gets the durable temp path just before the rename.
+    """
+    _ensure_config_dir()
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(path),
+        prefix=f".{os.path.basename(path)}.",
+        suffix=".tmp",
+    )
+    try:
+        with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())
+        if before_replace is not None:
+            before_replace(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(temp_path)
+        raise
+
+
 def _normalize_command_key(command_key: str) -> str:
     return command_key.replace(" ", ".").lower()
 
@@ -59,27 +126,133 @@ def _coerce_guild_list(raw: Any) -> Set[str]:
     return {str(raw)}
 
 
-_loaded_guilds: Dict[str, int] = _load_json(GUILDS_FILE, _GUILDS_DEFAULT)
-loaded_guilds: Dict[str, int] = {
-    name: int(guild_id)
-    for name, guild_id in _loaded_guilds.items()
-}
+_loaded_settings = _load_json(SETTINGS_FILE, _SETTINGS_DEFAULT)
+settings: Dict[str, Any] = {**_SETTINGS_DEFAULT, **_loaded_settings}
 
-_loaded_command_scopes = _load_json(COMMANDS_FILE, _COMMANDS_DEFAULT)
-command_scopes: Dict[str, Any] = {
-    _normalize_command_key(command_key): value
-    for command_key, value in _loaded_command_scopes.get("commands", {}).items()
-}
 
-_loaded_unmanaged = _load_json(UNMANAGED_FILE, _UNMANAGED_DEFAULT)
-_suppressed_guilds: Set[str] = {
-    str(guild_id) for guild_id in _loaded_unmanaged.get("suppressed", [])
+def get_setting(key: str) -> Any:
+    return settings.get(key, _SETTINGS_DEFAULT.get(key))
+
+
+def _load_json_snapshot() -> ConfigSnapshot:
+    """Read the JSON files, which are also the import/export format for other backends."""
+    loaded_guilds_raw: Dict[str, int] = _load_json(GUILDS_FILE, _GUILDS_DEFAULT)
+    loaded_scopes_raw = _load_json(COMMANDS_FILE, _COMMANDS_DEFAULT)
+    loaded_unmanaged_raw = _load_json(UNMANAGED_FILE, _UNMANAGED_DEFAULT)
+    return ConfigSnapshot(
+        guilds={name: int(guild_id) for name, guild_id in loaded_guilds_raw.items()},
+        scopes={
+            _normalize_command_key(command_key): value
+            for command_key, value in loaded_scopes_raw.get("commands", {}).items()
+        },
+        suppressed={str(guild_id) for guild_id in loaded_unmanaged_raw.get("suppressed", [])},
+    )
+
+
+# A single writer thread keeps off-loop flushes in submission order.
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="guildsync-config")
+
+
+def _create_store() -> ConfigStore:
+    backend = str(get_setting("storage_backend")).lower()
+    if backend == "sqlite":
+        _ensure_config_dir()
+        return SqliteConfigStore(DATABASE_FILE, _writer)
+    return JsonConfigStore(JOURNAL_FILE)
+
+
+_store = _create_store()
+_opened = _store.open(_load_json_snapshot)
+
+loaded_guilds: Dict[str, int] = _opened.guilds
+command_scopes: Dict[str, Any] = _opened.scopes
+_suppressed_guilds: Set[str] = _opened.suppressed
+
+# What ``guilds.json`` and ``commands.json`` hold on disk. Journaled changes reach the
+# files only at compaction, so manual edits are diffed against these, not live memory.
+_disk_snapshot = _load_json_snapshot()
+_disk_guilds: Dict[str, int] = _disk_snapshot.guilds
+_disk_scopes: Dict[str, Any] = _disk_snapshot.scopes
+del _disk_snapshot
+
+
+# Compiled scope entries: ``(default, exceptions)``. A command is enabled for a
+# guild when ``default`` differs from ``guild_id in exceptions``, which keeps the
+# hot path to a single dict lookup and set membership test.
+CompiledScope = Tuple[bool, FrozenSet[int]]
+
+_EMPTY_IDS: FrozenSet[int] = frozenset()
+_SCOPE_ENABLED: CompiledScope = (True, _EMPTY_IDS)
+_SCOPE_DISABLED: CompiledScope = (False, _EMPTY_IDS)
+
+
+def _coerce_int_ids(raw: Iterable[Any]) -> FrozenSet[int]:
+    ids: Set[int] = set()
+    for item in raw:
+        try:
+            ids.add(int(item))
+        except (TypeError, ValueError):
+            continue
+    return frozenset(ids)
+
+
+def _compile_scope(scope_definition: Any) -> CompiledScope:
+    if scope_definition is None:
+        return _SCOPE_ENABLED
+
+    if isinstance(scope_definition, dict):
+        if "exclude" in scope_definition:
+            return True, _coerce_int_ids(scope_definition.get("exclude") or [])
+        if "include" in scope_definition:
+            return False, _coerce_int_ids(scope_definition.get("include") or [])
+        if "guilds" in scope_definition:
+            return False, _coerce_int_ids(scope_definition.get("guilds") or [])
+
+    guilds = _coerce_guild_list(scope_definition)
+    if not guilds:
+        return _SCOPE_DISABLED
+
+    if "*" in guilds:
+        return _SCOPE_ENABLED
+
+    return False, _coerce_int_ids(guilds)
+
+
+_scope_index: Dict[str, CompiledScope] = {
+    command_key: _compile_scope(value)
+    for command_key, value in command_scopes.items()
 }
 
 
-def _save_unmanaged() -> None:
-    with open(UNMANAGED_FILE, "w", encoding="utf-8") as file:
-        json.dump({"suppressed": sorted(_suppressed_guilds)}, file, indent=4)
+_pending_ops: List[Dict[str, Any]] = []
+
+
+def _record(entry: Dict[str, Any]) -> None:
+    _pending_ops.append(entry)
+
+
+def _set_scope(normalized_key: str, value: Any) -> None:
+    command_scopes[normalized_key] = value
+    _scope_index[normalized_key] = _compile_scope(value)
+    _record({"op": "scope.set", "key": normalized_key, "value": value})
+
+
+def _drop_scope(normalized_key: str) -> None:
+    command_scopes.pop(normalized_key, None)
+    _scope_index.pop(normalized_key, None)
+    _record({"op": "scope.drop", "key": normalized_key})
+
+
+def is_command_scoped(command_key: str) -> bool:
+    """Return whether ``command_key`` has an explicit scope entry."""
+    return command_key in _scope_index
+
+
+def rebuild_scope_index() -> None:
+    """Recompile every scope entry, e.g. after ``command_scopes`` was replaced wholesale."""
+    _scope_index.clear()
+    for command_key, value in command_scopes.items():
+        _scope_index[command_key] = _compile_scope(value)
 
 
 def is_guild_suppressed(guild_id: int) -> bool:
@@ -92,7 +265,8 @@ def suppress_guild(guild_id: int) -> None:
         return
 
     _suppressed_guilds.add(key)
-    _save_unmanaged()
+    _record({"op": "suppress.add", "id": key})
+    _commit()
 
 
 def clear_suppressed_guild(guild_id: int) -> None:
@@ -101,21 +275,215 @@ def clear_suppressed_guild(guild_id: int) -> None:
         return
 
     _suppressed_guilds.remove(key)
-    _save_unmanaged()
+    _record({"op": "suppress.remove", "id": key})
+    _commit()
+
+
+def _flush_side_file(path: str, payload: Any) -> None:
+    """Write a side file on the config writer thread.
+
+    ``payload`` is serialised here, on the loop, so later changes cannot race the write.
+    """
+    text = json.dumps(payload, indent=4)
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _write_text_atomic(path, text)
+        return
+
+    def log_failure(future: "asyncio.Future[None]") -> None:
+        if not future.cancelled() and future.exception() is not None:
+            Logger.error("GuildSyncConfig -", f"Failed to write {os.path.basename(path)}: {future.exception()}")
+
+    loop.run_in_executor(_writer, _write_text_atomic, path, text).add_done_callback(log_failure)
+
+
+_loaded_sync_hashes = _load_json(SYNC_HASHES_FILE, _SYNC_HASHES_DEFAULT)
+_sync_hashes: Dict[str, str] = {
+    str(guild_id): str(digest)
+    for guild_id, digest in _loaded_sync_hashes.get("guilds", {}).items()
+}
+_sync_hashes_dirty = False
+
+
+def _sync_hash_key(guild_id: Optional[int]) -> str:
+    # ``None`` addresses the global command payload.
+    return "global" if guild_id is None else str(guild_id)
+
+
+def get_sync_hash(guild_id: Optional[int]) -> Optional[str]:
+    return _sync_hashes.get(_sync_hash_key(guild_id))
+
+
+def set_sync_hash(guild_id: Optional[int], digest: str) -> None:
+    """Record the payload hash Discord confirmed for a guild; persisted by ``flush_sync_hashes``."""
+    global _sync_hashes_dirty
+    key = _sync_hash_key(guild_id)
+    if _sync_hashes.get(key) == digest:
+        return
+
+    _sync_hashes[key] = digest
+    _sync_hashes_dirty = True
+
+
+def clear_sync_hash(guild_id: Optional[int]) -> None:
+    global _sync_hashes_dirty
+    if _sync_hashes.pop(_sync_hash_key(guild_id), None) is not None:
+        _sync_hashes_dirty = True
+
+
+def flush_sync_hashes() -> None:
+    global _sync_hashes_dirty
+    if not _sync_hashes_dirty:
+        return
+
+    _sync_hashes_dirty = False
+    _flush_side_file(SYNC_HASHES_FILE, {"guilds": dict(sorted(_sync_hashes.items()))})
+
+
+_loaded_unreachable = _load_json(UNREACHABLE_FILE, _UNREACHABLE_DEFAULT)
+# guild id -> (unix time the entry expires, reason)
+_unreachable: Dict[str, Tuple[float, str]] = {}
+for _guild_id, _entry in _loaded_unreachable.get("guilds", {}).items():
+    with suppress(KeyError, TypeError, ValueError):
+        _unreachable[str(_guild_id)] = (float(_entry["until"]), str(_entry.get("reason", "")))
+_unreachable_dirty = False
+
+
+def get_unreachable_guild(guild_id: int) -> Optional[str]:
+    """Return why ``guild_id`` recently failed to resolve, or ``None`` once its TTL has passed."""
+    entry = _unreachable.get(str(guild_id))
+    if entry is None or entry[0] <= time.time():
+        return None
+    return entry[1]
+
+
+def mark_guild_unreachable(guild_id: int, reason: str) -> None:
+    """Skip fetching ``guild_id`` for ``unreachable_guild_ttl_seconds``; persisted by ``flush_unreachable_guilds``."""
+    global _unreachable_dirty
+    ttl = float(get_setting("unreachable_guild_ttl_seconds"))
+    if ttl <= 0:
+        return
+    _unreachable[str(guild_id)] = (time.time() + ttl, reason)
+    _unreachable_dirty = True
+
+
+def clear_unreachable_guild(guild_id: int) -> None:
+    global _unreachable_dirty
+    if _unreachable.pop(str(guild_id), None) is not None:
+        _unreachable_dirty = True
+
+
+def flush_unreachable_guilds() -> None:
+    global _unreachable_dirty
+    if not _unreachable_dirty:
+        return
+
+    now = time.time()
+    payload = {
+        guild_id: {"until": until, "reason": reason}
+        for guild_id, (until, reason) in sorted(_unreachable.items())
+        if until > now
+    }
+    _unreachable_dirty = False
+    _flush_side_file(UNREACHABLE_FILE, {"guilds": payload})
+
+
+_loaded_invites = _load_json(INVITES_FILE, _INVITES_DEFAULT)
+# guild id -> {"status": "pending" | "sent", "queued_at", "sent_at", "channel_id", "message_id"}
+_invites: Dict[str, Dict[str, Any]] = {
+    str(guild_id): dict(entry)
+    for guild_id, entry in _loaded_invites.get("invites", {}).items()
+    if isinstance(entry, dict)
+}
+# Pending guild ids in send order; a dict keeps insertion order with O(1) removal.
+_invite_outbox: Dict[int, None] = dict.fromkeys(
+    int(guild_id)
+    for guild_id, entry in sorted(_invites.items(), key=lambda item: item[1].get("queued_at", 0.0))
+    if entry.get("status") == "pending"
+)
+_invites_dirty = False
+
+
+def queue_invite(guild_id: int) -> bool:
+    """Add ``guild_id`` to the invite outbox; returns ``False`` if it is already queued or sent."""
+    global _invites_dirty
+    key = str(guild_id)
+    if key in _invites:
+        return False
+    _invites[key] = {"status": "pending", "queued_at": time.time()}
+    _invite_outbox[int(guild_id)] = None
+    _invites_dirty = True
+    return True
+
+
+def has_pending_invites() -> bool:
+    return bool(_invite_outbox)
+
+
+def next_pending_invite() -> Optional[int]:
+    """The oldest outstanding invite; it leaves the outbox once sent or dropped."""
+    return next(iter(_invite_outbox), None)
+
+
+def mark_invite_sent(guild_id: int, channel_id: int, message_id: int) -> None:
+    global _invites_dirty
+    entry = _invites.setdefault(str(guild_id), {"queued_at": time.time()})
+    entry.update(status="sent", sent_at=time.time(), channel_id=channel_id, message_id=message_id)
+    _invite_outbox.pop(int(guild_id), None)
+    _invites_dirty = True
+
+
+def drop_invite(guild_id: int) -> None:
+    global _invites_dirty
+    _invite_outbox.pop(int(guild_id), None)
+    if _invites.pop(str(guild_id), None) is not None:
+        _invites_dirty = True
+
+
+def flush_invites() -> None:
+    global _invites_dirty
+    if not _invites_dirty:
+        return
+
+    _invites_dirty = False
+    _flush_side_file(INVITES_FILE, {"invites": dict(sorted(_invites.items()))})
 
 
 def _stringify_ids(ids: Iterable[Any]) -> Set[str]:
     return {str(item) for item in ids}
 
 
-def _save_guilds() -> None:
-    serializable = {
-        name: int(guild_id)
-        for name, guild_id in sorted(loaded_guilds.items(), key=lambda item: item[0].lower())
-    }
+# guild id -> number of configured names pointing at it, for O(1) membership checks.
+_configured_ids: Dict[int, int] = {}
+for _guild_id in loaded_guilds.values():
+    _configured_ids[_guild_id] = _configured_ids.get(_guild_id, 0) + 1
+
+
+def _unindex_guild(guild_id: Optional[int]) -> None:
+    if guild_id is None:
+        return
+    remaining = _configured_ids.get(guild_id, 0) - 1
+    if remaining > 0:
+        _configured_ids[guild_id] = remaining
+    else:
+        _configured_ids.pop(guild_id, None)
 
-    with open(GUILDS_FILE, "w", encoding="utf-8") as file:
-        json.dump(serializable, file, indent=4)
+
+def _set_guild(name: str, guild_id: int) -> None:
+    _unindex_guild(loaded_guilds.get(name))
+    loaded_guilds[name] = guild_id
+    _configured_ids[guild_id] = _configured_ids.get(guild_id, 0) + 1
+    _record({"op": "guild.set", "name": name, "id": guild_id})
+
+
+def _drop_guild(name: str) -> None:
+    _unindex_guild(loaded_guilds.pop(name, None))
+    _record({"op": "guild.drop", "name": name})
+
+
+def is_guild_configured(guild_id: int) -> bool:
+    return guild_id in _configured_ids
 
 
 def register_guild(guild_name: str, guild_id: int, *, overwrite: bool = False) -> bool:
@@ -132,52 +500,322 @@ def register_guild(guild_name: str, guild_id: int, *, overwrite: bool = False) -
             f"Guild name '{normalized_name}' already maps to a different guild ({existing})."
         )
 
-    loaded_guilds[normalized_name] = int(guild_id)
+    _set_guild(normalized_name, int(guild_id))
     clear_suppressed_guild(guild_id)
-    _save_guilds()
+    _commit()
     return True
 
 
-def _save_command_scopes() -> None:
-    serializable = {
-        key: value
-        for key, value in sorted(command_scopes.items())
+def _command_scopes_payload() -> Dict[str, Any]:
+    return {
+        "commands": {
+            key: value
+            for key, value in sorted(command_scopes.items())
+        }
     }
 
-    with open(COMMANDS_FILE, "w", encoding="utf-8") as file:
-        json.dump({"commands": serializable}, file, indent=4)
 
+def _guilds_payload() -> Dict[str, int]:
+    return {
+        name: int(guild_id)
+        for name, guild_id in sorted(loaded_guilds.items(), key=lambda item: item[0].lower())
+    }
 
-def get_guild_id(guild_name: str) -> Optional[int]:
-    return loaded_guilds.get(guild_name)
 
+def _unmanaged_payload() -> Dict[str, Any]:
+    return {"suppressed": sorted(_suppressed_guilds)}
 
-def is_command_enabled_for_guild(command_key: str, guild_id: int) -> bool:
-    normalized_key = _normalize_command_key(command_key)
-    scope_definition = command_scopes.get(normalized_key)
 
-    if scope_definition is None:
-        return True
+_scope_batch_depth = 0
+_fsync_scheduled = False
+_compaction_task: Optional["asyncio.Task[bool]"] = None
 
-    if isinstance(scope_definition, dict):
-        if "exclude" in scope_definition:
-            excluded = _stringify_ids(scope_definition.get("exclude", []))
-            return str(guild_id) not in excluded
-        if "include" in scope_definition:
-            included = _stringify_ids(scope_definition.get("include", []))
-            return str(guild_id) in included
-        if "guilds" in scope_definition:
-            included = _stringify_ids(scope_definition.get("guilds", []))
-            return str(guild_id) in included
 
-    guilds = _coerce_guild_list(scope_definition)
-    if not guilds:
+def _commit() -> None:
+    """Append recorded mutations to the journal, unless a transaction is still open."""
+    if _scope_batch_depth or not _pending_ops:
+        return
+
+    _store.write(_pending_ops)
+    _pending_ops.clear()
+    _schedule_journal_sync()
+    _maybe_schedule_compaction()
+
+
+def _log_sync_failure(future: "asyncio.Future[None]") -> None:
+    if not future.cancelled() and future.exception() is not None:
+        Logger.error("GuildSyncConfig -", f"Failed to sync config changes to disk: {future.exception()}")
+
+
+def _schedule_journal_sync() -> None:
+    """Batch fsyncs: at most one per ``journal_fsync_interval_seconds``, run off the event loop."""
+    global _fsync_scheduled
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        _store.sync()
+        return
+
+    if _fsync_scheduled:
+        return
+
+    def submit() -> None:
+        global _fsync_scheduled
+        _fsync_scheduled = False
+        loop.run_in_executor(_writer, _store.sync).add_done_callback(_log_sync_failure)
+
+    _fsync_scheduled = True
+    loop.call_later(float(get_setting("journal_fsync_interval_seconds")), submit)
+
+
+def _log_compaction_failure(task: "asyncio.Task[bool]") -> None:
+    if not task.cancelled() and task.exception() is not None:
+        Logger.error("GuildSyncConfig -", f"Failed to compact config journal: {task.exception()}")
+
+
+def _maybe_schedule_compaction() -> None:
+    global _compaction_task
+    if _store.pending() < int(get_setting("journal_compact_threshold")):
+        return
+    if _compaction_task is not None and not _compaction_task.done():
+        return
+    try:
+        _compaction_task = asyncio.get_running_loop().create_task(compact_journal())
+        _compaction_task.add_done_callback(_log_compaction_failure)
+    except RuntimeError:
+        _compact_now()
+
+
+FileStamp = Tuple[int, int]
+# Stamps of snapshot files this process wrote, so the config watcher can ignore them.
+_own_stamps: Dict[str, FileStamp] = {}
+
+
+def file_stamp(path: str) -> Optional[FileStamp]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def is_own_write(path: str, stamp: Optional[FileStamp]) -> bool:
+    return stamp is not None and _own_stamps.get(path) == stamp
+
+
+def _snapshot_texts() -> Dict[str, str]:
+    return {
+        GUILDS_FILE: json.dumps(_guilds_payload(), indent=4),
+        COMMANDS_FILE: json.dumps(_command_scopes_payload(), indent=4),
+        UNMANAGED_FILE: json.dumps(_unmanaged_payload(), indent=4),
+    }
+
+
+def _remember_disk(texts: Dict[str, str]) -> None:
+    """Record what the snapshot files now contain; runs on the loop once the write has landed."""
+    global _disk_guilds, _disk_scopes
+    for path, text in texts.items():
+        if path == GUILDS_FILE:
+            _disk_guilds = {name: int(guild_id) for name, guild_id in json.loads(text).items()}
+        elif path == COMMANDS_FILE:
+            _disk_scopes = dict(json.loads(text)["commands"])
+
+
+def _write_snapshots(texts: Dict[str, str]) -> Dict[str, FileStamp]:
+    """Write the snapshot files and return their stamps, for the loop to record in ``_own_stamps``."""
+    stamps: Dict[str, FileStamp] = {}
+    for path, text in texts.items():
+        def before_replace(temp_path: str, path: str = path) -> None:
+            # A rename keeps the temp file's mtime and size, so this is the final file's stamp.
+            stamp = file_stamp(temp_path)
+            if stamp is not None:
+                stamps[path] = stamp
+
+        _write_text_atomic(path, text, before_replace)
+    return stamps
+
+
+def _write_compaction(texts: Dict[str, str], previous: Any) -> Dict[str, FileStamp]:
+    # Fold in entries parked by a failed compaction first, so they outlive this one failing too.
+    _store.prepare_compaction(previous)
+    stamps = _write_snapshots(texts)
+    # Snapshots are durable now, so the rotated journal can go.
+    _store.finish_compaction(previous)
+    return stamps
+
+
+def _compact_now() -> None:
+    texts = _snapshot_texts()
+    _own_stamps.update(_write_compaction(texts, _store.begin_compaction()))
+    _remember_disk(texts)
+
+
+async def compact_journal() -> bool:
+    """Fold the journal back into the JSON snapshots; returns whether anything was compacted."""
+    if not _store.pending() or _scope_batch_depth:
         return False
 
-    if "*" in guilds:
-        return True
+    # Snapshot and rotate in one step on the loop so no mutation falls between them.
+    texts = _snapshot_texts()
+    previous = _store.begin_compaction()
+    stamps = await asyncio.get_running_loop().run_in_executor(_writer, _write_compaction, texts, previous)
+    # Only a landed write moves the disk copies; a watcher poll that beats this
+    # sees our own changes, which are already applied in memory.
+    _own_stamps.update(stamps)
+    _remember_disk(texts)
+    return True
 
-    return str(guild_id) in guilds
+
+async def export_json_snapshots() -> None:
+    """Write the current config to the JSON files, e.g. to mirror the SQLite store."""
+    texts = _snapshot_texts()
+    stamps = await asyncio.get_running_loop().run_in_executor(_writer, _write_snapshots, texts)
+    _own_stamps.update(stamps)
+    _remember_disk(texts)
+
+
+async def close_config_store() -> None:
+    """Release the store once queued writes have landed; it reopens lazily if written again."""
+    await asyncio.get_running_loop().run_in_executor(_writer, _store.close)
+
+
+def storage_backend() -> str:
+    return _store.name
+
+
+@asynccontextmanager
+async def scope_transaction() -> AsyncIterator[None]:
+    """Batch scope mutations in memory and commit them to the journal once on exit.
+
+    The single fsync happens in a worker thread. If the block raises, every
+    scope mutation made inside it is rolled back and not journaled; guild and
+    suppression changes made inside it stay applied and are journaled.
+    """
+    global _scope_batch_depth
+    outermost = _scope_batch_depth == 0
+    snapshot = copy.deepcopy(command_scopes) if outermost else None
+    start = len(_pending_ops)
+    _scope_batch_depth += 1
+    try:
+        yield
+    except BaseException:
+        if outermost:
+            command_scopes.clear()
+            command_scopes.update(snapshot or {})
+            rebuild_scope_index()
+            _pending_ops[start:] = [op for op in _pending_ops[start:] if not op["op"].startswith("scope.")]
+            if _pending_ops:
+                _store.write(_pending_ops)
+                _pending_ops.clear()
+                _schedule_journal_sync()
+        raise
+    finally:
+        _scope_batch_depth -= 1
+
+    if not outermost or not _pending_ops:
+        return
+
+    _store.write(_pending_ops)
+    _pending_ops.clear()
+    await asyncio.get_running_loop().run_in_executor(_writer, _store.sync)
+    _maybe_schedule_compaction()
+
+
+ScopeChange = Tuple[CompiledScope, CompiledScope]
+_MISSING = object()
+
+
+def scope_allows(compiled: CompiledScope, guild_id: int) -> bool:
+    default, exceptions = compiled
+    return default != (guild_id in exceptions)
+
+
+def replace_command_scopes(raw: Any) -> Dict[str, ScopeChange]:
+    """Adopt an externally edited ``commands.json`` payload.
+
+    Only keys the edit changed relative to the file's previous contents are
+    applied, so journaled changes that have not reached the file yet are kept.
+    Returns ``{key: (old, new)}`` compiled scopes for every changed key.
+    """
+    global _disk_scopes
+    entries = raw.get("commands") if isinstance(raw, dict) else None
+    if not isinstance(entries, dict):
+        raise ValueError("commands.json must contain a 'commands' object.")
+
+    parsed = {_normalize_command_key(str(key)): value for key, value in entries.items()}
+    base = _disk_scopes
+    _disk_scopes = parsed
+    changes: Dict[str, ScopeChange] = {}
+    for key in set(base) | set(parsed):
+        new_value = parsed.get(key, _MISSING)
+        if base.get(key, _MISSING) == new_value or command_scopes.get(key, _MISSING) == new_value:
+            continue
+
+        before = _scope_index.get(key, _SCOPE_ENABLED)
+        if new_value is _MISSING:
+            _drop_scope(key)
+        else:
+            _set_scope(key, new_value)
+        changes[key] = (before, _scope_index.get(key, _SCOPE_ENABLED))
+
+    _commit()
+    return changes
+
+
+def replace_guilds(raw: Any) -> Tuple[Dict[int, str], Set[int]]:
+    """Adopt an externally edited ``guilds.json`` payload.
+
+    Like ``replace_command_scopes``, only names the edit changed are applied.
+    Returns ``(added, removed)``: newly configured guild ids mapped to their
+    name, and ids that are no longer configured under any name.
+    """
+    global _disk_guilds
+    if not isinstance(raw, dict):
+        raise ValueError("guilds.json must contain an object of name -> guild id.")
+
+    parsed = {str(name).strip(): int(guild_id) for name, guild_id in raw.items()}
+    base = _disk_guilds
+    _disk_guilds = parsed
+    previous_ids = set(loaded_guilds.values())
+    for name in set(base) | set(parsed):
+        guild_id = parsed.get(name)
+        if base.get(name) == guild_id or loaded_guilds.get(name) == guild_id:
+            continue
+
+        if guild_id is None:
+            _drop_guild(name)
+        else:
+            _set_guild(name, guild_id)
+
+    current_ids = set(loaded_guilds.values())
+    added = {
+        guild_id: name
+        for name, guild_id in loaded_guilds.items()
+        if guild_id not in previous_ids
+    }
+    for guild_id in added:
+        clear_suppressed_guild(guild_id)
+    _commit()
+    return added, previous_ids - current_ids
+
+
+def get_guild_id(guild_name: str) -> Optional[int]:
+    return loaded_guilds.get(guild_name)
+
+
+def is_command_enabled_for_guild(command_key: str, guild_id: int) -> bool:
+    compiled = _scope_index.get(command_key)
+    if compiled is None:
+        # Keys produced by CommandCloner are already normalized; only pay for
+        # normalization when the caller passed a raw key.
+        if " " not in command_key and command_key.islower():
+            return True
+        compiled = _scope_index.get(_normalize_command_key(command_key))
+        if compiled is None:
+            return True
+
+    default, exceptions = compiled
+    return default != (guild_id in exceptions)
 
 
 def disable_command_for_guild(command_key: str, guild_id: int) -> bool:
@@ -186,8 +824,8 @@ def disable_command_for_guild(command_key: str, guild_id: int) -> bool:
     current = command_scopes.get(normalized_key)
 
     if current is None or current == "*":
-        command_scopes[normalized_key] = {"exclude": [guild_str]}
-        _save_command_scopes()
+        _set_scope(normalized_key, {"exclude": [guild_str]})
+        _commit()
         return True
 
     if isinstance(current, dict) and "exclude" in current:
@@ -195,8 +833,8 @@ def disable_command_for_guild(command_key: str, guild_id: int) -> bool:
         if guild_str in excluded:
             return False
         excluded.add(guild_str)
-        command_scopes[normalized_key] = {"exclude": sorted(excluded)}
-        _save_command_scopes()
+        _set_scope(normalized_key, {"exclude": sorted(excluded)})
+        _commit()
         return True
 
     if isinstance(current, dict):
@@ -206,8 +844,8 @@ def disable_command_for_guild(command_key: str, guild_id: int) -> bool:
         if guild_str not in included:
             return False
         included.discard(guild_str)
-        command_scopes[normalized_key] = sorted(included)
-        _save_command_scopes()
+        _set_scope(normalized_key, sorted(included))
+        _commit()
         return True
 
     if isinstance(current, (list, tuple, set)):
@@ -215,8 +853,8 @@ def disable_command_for_guild(command_key: str, guild_id: int) -> bool:
         if guild_str not in included:
             return False
         included.discard(guild_str)
-        command_scopes[normalized_key] = sorted(included)
-        _save_command_scopes()
+        _set_scope(normalized_key, sorted(included))
+        _commit()
         return True
 
     return False
@@ -236,10 +874,10 @@ def enable_command_for_guild(command_key: str, guild_id: int) -> bool:
             return False
         excluded.discard(guild_str)
         if excluded:
-            command_scopes[normalized_key] = {"exclude": sorted(excluded)}
+            _set_scope(normalized_key, {"exclude": sorted(excluded)})
         else:
-            command_scopes.pop(normalized_key, None)
-        _save_command_scopes()
+            _drop_scope(normalized_key)
+        _commit()
         return True
 
     if isinstance(current, dict):
@@ -249,8 +887,8 @@ def enable_command_for_guild(command_key: str, guild_id: int) -> bool:
         if guild_str in included:
             return False
         included.add(guild_str)
-        command_scopes[normalized_key] = sorted(included)
-        _save_command_scopes()
+        _set_scope(normalized_key, sorted(included))
+        _commit()
         return True
 
     if isinstance(current, (list, tuple, set)):
@@ -258,14 +896,14 @@ def enable_command_for_guild(command_key: str, guild_id: int) -> bool:
         if guild_str in included:
             return False
         included.add(guild_str)
-        command_scopes[normalized_key] = sorted(included)
-        _save_command_scopes()
+        _set_scope(normalized_key, sorted(included))
+        _commit()
         return True
 
     if current == []:
         # Previously disabled globally – re-enable only for this guild.
-        command_scopes[normalized_key] = [guild_str]
-        _save_command_scopes()
+        _set_scope(normalized_key, [guild_str])
+        _commit()
         return True
 
     return False
@@ -276,8 +914,8 @@ def disable_command_globally(command_key: str) -> bool:
     previous = command_scopes.get(normalized_key)
     if previous == []:
         return False
-    command_scopes[normalized_key] = []
-    _save_command_scopes()
+    _set_scope(normalized_key, [])
+    _commit()
     return True
 
 
@@ -285,8 +923,8 @@ def enable_command_globally(command_key: str) -> bool:
     normalized_key = _normalize_command_key(command_key)
     if normalized_key not in command_scopes:
         return False
-    command_scopes.pop(normalized_key, None)
-    _save_command_scopes()
+    _drop_scope(normalized_key)
+    _commit()
     return True
 
 
@@ -0,0 +1,241 @@
+import json
+import sqlite3
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+
+from interface.logger import Logger
+
+from .journal import MutationJournal
+
+
+@dataclass
+class ConfigSnapshot:
+    guilds: Dict[str, int] = field(default_factory=dict)
+    scopes: Dict[str, Any] = field(default_factory=dict)
+    suppressed: Set[str] = field(default_factory=set)
+
+
+SnapshotLoader = Callable[[], ConfigSnapshot]
+
+
+def apply_entry(snapshot: ConfigSnapshot, entry: Dict[str, Any]) -> None:
+    """Apply one recorded mutation to ``snapshot``."""
+    op = entry.get("op")
+    if op == "scope.set":
+        snapshot.scopes[str(entry["key"])] = entry.get("value")
+    elif op == "scope.drop":
+        snapshot.scopes.pop(str(entry["key"]), None)
+    elif op == "guild.set":
+        snapshot.guilds[str(entry["name"])] = int(entry["id"])
+    elif op == "guild.drop":
+        snapshot.guilds.pop(str(entry["name"]), None)
+    elif op == "suppress.add":
+        snapshot.suppressed.add(str(entry["id"]))
+    elif op == "suppress.remove":
+        snapshot.suppressed.discard(str(entry["id"]))
+
+
+class ConfigStore(ABC):
+    """Persistence backend for the guild registry, command scopes and suppressions.
+
+    ``write`` is called on the event loop and must stay cheap; ``sync``,
+    ``close`` and the compaction hooks run on the config writer thread.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def open(self, seed: SnapshotLoader) -> ConfigSnapshot:
+        ...
+
+    @abstractmethod
+    def write(self, entries: List[Dict[str, Any]]) -> None:
+        ...
+
+    def sync(self) -> None:
+        pass
+
+    def pending(self) -> int:
+        """Number of entries waiting to be compacted into the JSON snapshots."""
+        return 0
+
+    def begin_compaction(self) -> Any:
+        return None
+
+    def prepare_compaction(self, token: Any) -> None:
+        """Runs before the snapshots are written."""
+
+    def finish_compaction(self, token: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class JsonConfigStore(ConfigStore):
+    """JSON snapshots plus an append-only mutation journal."""
+
+    name = "json"
+
+    def __init__(self, journal_path: str) -> None:
+        self.journal = MutationJournal(journal_path)
+
+    def open(self, seed: SnapshotLoader) -> ConfigSnapshot:
+        snapshot = seed()
+        # Replay changes recorded since the snapshots were last compacted.
+        for entry in self.journal.read():
+            try:
+                apply_entry(snapshot, entry)
+            except (KeyError, TypeError, ValueError):
+                continue
+        return snapshot
+
+    def write(self, entries: List[Dict[str, Any]]) -> None:
+        self.journal.append(entries)
+
+    def sync(self) -> None:
+        self.journal.sync()
+
+    def pending(self) -> int:
+        return len(self.journal)
+
+    def begin_compaction(self) -> Any:
+        return self.journal.rotate()
+
+    def prepare_compaction(self, token: Any) -> None:
+        self.journal.fold_rotated(token)
+
+    def finish_compaction(self, token: Any) -> None:
+        self.journal.finish_compaction()
+
+    def close(self) -> None:
+        self.journal.close()
+
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS guilds (name TEXT PRIMARY KEY, guild_id INTEGER NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS scopes (command_key TEXT PRIMARY KEY, scope TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS suppressed (guild_id INTEGER PRIMARY KEY)",
+)
+# ``PRAGMA user_version`` once the JSON files have been imported.
+_SEEDED = 1
+
+
+class SqliteConfigStore(ConfigStore):
+    """SQLite-backed store; every mutation is an indexed upsert or delete.
+
+    The connection is only touched from ``executor`` (the single config writer
+    thread), so statements run off the event loop and in submission order.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, executor: Executor) -> None:
+        self.path = path
+        self.executor = executor
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def open(self, seed: SnapshotLoader) -> ConfigSnapshot:
+        return self.executor.submit(self._open, seed).result()
+
+    def _open(self, seed: SnapshotLoader) -> ConfigSnapshot:
+        connection = self._connect()
+        (version,) = connection.execute("PRAGMA user_version").fetchone()
+        if version < _SEEDED:
+            # First run on SQLite: import the existing JSON files once. Later
+            # starts trust the database, even if everything in it was removed.
+            empty = all(
+                connection.execute(f"SELECT NOT EXISTS (SELECT 1 FROM {table})").fetchone()[0]
+                for table in ("guilds", "scopes", "suppressed")
+            )
+            with connection:
+                if empty:
+                    self._replace(connection, seed())
+                connection.execute(f"PRAGMA user_version = {_SEEDED}")
+
+        snapshot = ConfigSnapshot()
+        snapshot.guilds = {
+            name: int(guild_id)
+            for name, guild_id in connection.execute("SELECT name, guild_id FROM guilds")
+        }
+        snapshot.scopes = {
+            key: json.loads(scope)
+            for key, scope in connection.execute("SELECT command_key, scope FROM scopes")
+        }
+        snapshot.suppressed = {
+            str(guild_id) for (guild_id,) in connection.execute("SELECT guild_id FROM suppressed")
+        }
+        return snapshot
+
+    def _replace(self, connection: sqlite3.Connection, snapshot: ConfigSnapshot) -> None:
+        """Overwrite every table with ``snapshot``; the caller holds the transaction."""
+        connection.execute("DELETE FROM guilds")
+        connection.execute("DELETE FROM scopes")
+        connection.execute("DELETE FROM suppressed")
+        connection.executemany(
+            "INSERT INTO guilds (name, guild_id) VALUES (?, ?)",
+            snapshot.guilds.items(),
+        )
+        connection.executemany(
+            "INSERT INTO scopes (command_key, scope) VALUES (?, ?)",
+            ((key, json.dumps(value)) for key, value in snapshot.scopes.items()),
+        )
+        connection.executemany(
+            "INSERT INTO suppressed (guild_id) VALUES (?)",
+            ((int(guild_id),) for guild_id in snapshot.suppressed),
+        )
+
+    def write(self, entries: List[Dict[str, Any]]) -> None:
+        self.executor.submit(self._apply, list(entries)).add_done_callback(self._log_failure)
+
+    @staticmethod
+    def _log_failure(future: "Future[None]") -> None:
+        if not future.cancelled() and future.exception() is not None:
+            Logger.error("GuildSyncConfig -", f"Failed to write config changes to SQLite: {future.exception()}")
+
+    def _apply(self, entries: Iterable[Dict[str, Any]]) -> None:
+        connection = self._connect()
+        with connection:
+            for entry in entries:
+                op = entry.get("op")
+                if op == "scope.set":
+                    connection.execute(
+                        "INSERT INTO scopes (command_key, scope) VALUES (?, ?) "
+                        "ON CONFLICT(command_key) DO UPDATE SET scope = excluded.scope",
+                        (str(entry["key"]), json.dumps(entry.get("value"))),
+                    )
+                elif op == "scope.drop":
+                    connection.execute("DELETE FROM scopes WHERE command_key = ?", (str(entry["key"]),))
+                elif op == "guild.set":
+                    connection.execute(
+                        "INSERT INTO guilds (name, guild_id) VALUES (?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET guild_id = excluded.guild_id",
+                        (str(entry["name"]), int(entry["id"])),
+                    )
+                elif op == "guild.drop":
+                    connection.execute("DELETE FROM guilds WHERE name = ?", (str(entry["name"]),))
+                elif op == "suppress.add":
+                    connection.execute(
+                        "INSERT OR IGNORE INTO suppressed (guild_id) VALUES (?)",
+                        (int(entry["id"]),),
+                    )
+                elif op == "suppress.remove":
+                    connection.execute("DELETE FROM suppressed WHERE guild_id = ?", (int(entry["id"]),))
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
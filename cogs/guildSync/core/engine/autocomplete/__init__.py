@@ -0,0 +1,4 @@
+from .main import AutocompleteEngine
+from .modules.index import AutocompleteIndex, Candidate
+
+__all__ = ["AutocompleteEngine", "AutocompleteIndex", "Candidate"]
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, Hashable, List, Tuple
+
+from .modules.cache import UserLRUCache
+from .modules.index import AutocompleteIndex, Candidate
+
+IndexBuilder = Callable[[], AutocompleteIndex]
+
+
+class AutocompleteEngine:
+    """Shared ranked autocomplete over named candidate sets.
+
+    Each set is identified by ``name`` and rebuilt only when its ``version``
+    changes. Results are cached per user so retyped or backspaced prefixes are
+    answered without ranking again.
+    """
+
+    MAX_CHOICES = 25
+
+    def __init__(self, *, per_user: int = 32, max_users: int = 256) -> None:
+        self._indexes: Dict[str, Tuple[Hashable, AutocompleteIndex]] = {}
+        self._recent: UserLRUCache[List[Candidate]] = UserLRUCache(per_user=per_user, max_users=max_users)
+
+    def index(self, name: str, version: Hashable, build: IndexBuilder) -> AutocompleteIndex:
+        cached = self._indexes.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        index = build()
+        self._indexes[name] = (version, index)
+        return index
+
+    def complete(
+        self,
+        user_id: int,
+        name: str,
+        version: Hashable,
+        build: IndexBuilder,
+        query: str,
+        limit: int = MAX_CHOICES,
+    ) -> List[Candidate]:
+        cache_key = (name, version, query, limit)
+        cached = self._recent.get(user_id, cache_key)
+        if cached is not None:
+            return cached
+
+        results = self.index(name, version, build).search(query, limit)
+        self._recent.put(user_id, cache_key, results)
+        return results
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class UserLRUCache(Generic[V]):
+    """A few recent entries per user, bounded in both users and entries per user."""
+
+    def __init__(self, *, per_user: int, max_users: int) -> None:
+        self.per_user = max(1, per_user)
+        self.max_users = max(1, max_users)
+        self._users: "OrderedDict[int, OrderedDict[Hashable, V]]" = OrderedDict()
+
+    def get(self, user_id: int, key: Hashable) -> Optional[V]:
+        entries = self._users.get(user_id)
+        if entries is None or key not in entries:
+            return None
+        self._users.move_to_end(user_id)
+        entries.move_to_end(key)
+        return entries[key]
+
+    def put(self, user_id: int, key: Hashable, value: V) -> None:
+        entries = self._users.get(user_id)
+        if entries is None:
+            entries = self._users[user_id] = OrderedDict()
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+        self._users.move_to_end(user_id)
+        entries[key] = value
+        entries.move_to_end(key)
+        while len(entries) > self.per_user:
+            entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._users.clear()
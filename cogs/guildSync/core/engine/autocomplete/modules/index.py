@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import heapq
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_SEPARATORS = re.compile(r"[\W_]+")
+
+
+def normalize(text: str) -> str:
+    """Casefold and collapse punctuation (``/``, ``.``, ``-``, brackets) into single spaces."""
+    return _SEPARATORS.sub(" ", text.casefold()).strip()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[index:index + 3] for index in range(len(text) - 2)}
+
+
+@dataclass(frozen=True)
+class Candidate:
+    value: str
+    label: str
+
+
+# Rank tiers, best first.
+_PREFIX, _WORD_PREFIX, _SUBSTRING, _SUBSEQUENCE, _FUZZY = range(5)
+Score = Tuple[int, int, int]
+
+
+class AutocompleteIndex:
+    """Pre-normalized candidates with trigram and character indexes, ranked per query.
+
+    Candidates keep the order they were given in, which breaks ties, so callers
+    pass them pre-sorted.
+    """
+
+    def __init__(self, candidates: Iterable[Candidate], *, search_texts: Optional[Iterable[str]] = None) -> None:
+        self.candidates: List[Candidate] = list(candidates)
+        texts = search_texts if search_texts is not None else (c.label for c in self.candidates)
+        self._texts: List[str] = [normalize(text) for text in texts]
+        # Leading space lets a single ``in`` test find matches at word starts.
+        self._padded: List[str] = [f" {text}" for text in self._texts]
+        self._postings: Dict[str, List[int]] = {}
+        # One- and two-character word starts, for queries too short to have trigrams.
+        self._word_starts: Dict[str, List[int]] = {}
+        # Every candidate containing a character, for subsequence matches that share no trigram with the query.
+        self._chars: Dict[str, Set[int]] = {}
+        for position, text in enumerate(self._texts):
+            for trigram in _trigrams(text):
+                self._postings.setdefault(trigram, []).append(position)
+            for start in {word[:length] for word in text.split() for length in (1, 2)}:
+                self._word_starts.setdefault(start, []).append(position)
+            for char in set(text):
+                self._chars.setdefault(char, set()).add(position)
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def search(self, query: str, limit: int) -> List[Candidate]:
+        needle = normalize(query)
+        if not needle:
+            return self.candidates[:limit]
+
+        scored: List[Tuple[Score, int]] = []
+        query_trigrams = _trigrams(needle)
+        if query_trigrams:
+            # Anything sharing enough trigrams with the query; exact substrings share all of them.
+            overlap: Dict[int, int] = {}
+            for trigram in query_trigrams:
+                for position in self._postings.get(trigram, ()):
+                    overlap[position] = overlap.get(position, 0) + 1
+            required = max(1, (len(query_trigrams) + 1) // 2)
+            seen: Set[int] = set()
+            for position, shared in overlap.items():
+                if shared < required:
+                    continue
+                score = self._score(needle, position)
+                if score is None:
+                    score = (_FUZZY, len(query_trigrams) - shared, len(self._texts[position]))
+                scored.append((score, position))
+                seen.add(position)
+            # "syc" shares no trigram with "sync", so subsequences come from the character index.
+            for position in self._containing_all(needle) - seen:
+                score = self._score(needle, position)
+                if score is not None:
+                    scored.append((score, position))
+        else:
+            starts = self._word_starts.get(needle, ())
+            for position in starts:
+                score = self._score(needle, position)
+                if score is not None:
+                    scored.append((score, position))
+            if len(scored) < limit:
+                # Too few word-start hits; mid-word and subsequence matches rank below them anyway.
+                for position in self._containing_all(needle) - set(starts):
+                    score = self._score(needle, position)
+                    if score is not None:
+                        scored.append((score, position))
+
+        return [self.candidates[position] for _, position in heapq.nsmallest(limit, scored)]
+
+    def _containing_all(self, needle: str) -> Set[int]:
+        """Candidates containing every character of ``needle``; a superset of its subsequence matches."""
+        postings = sorted((self._chars.get(char, set()) for char in set(needle)), key=len)
+        if not postings:
+            return set()
+        return postings[0].intersection(*postings[1:])
+
+    def _score(self, needle: str, position: int) -> Optional[Score]:
+        text = self._texts[position]
+        if text.startswith(needle):
+            return _PREFIX, 0, len(text)
+        if f" {needle}" in self._padded[position]:
+            return _WORD_PREFIX, 0, len(text)
+        index = text.find(needle)
+        if index >= 0:
+            return _SUBSTRING, index, len(text)
+
+        # Subsequence: every query character in order; tighter spans rank higher.
+        start = cursor = text.find(needle[0])
+        if start < 0:
+            return None
+        for char in needle[1:]:
+            cursor = text.find(char, cursor + 1)
+            if cursor < 0:
+                return None
+        return _SUBSEQUENCE, cursor - start, len(text)
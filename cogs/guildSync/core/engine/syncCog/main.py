@@ -109,7 +109,9 @@ class SyncCogEngine:
         return True, message
 
     async def _resync_commands(self) -> Tuple[int, Optional[str]]:
-        guilds = self.guild_engine.get_synced_guilds()
+        # Loading, unloading or reloading an extension changes the command tree.
+        self.commands_engine.invalidate_command_index()
+        guilds = self.guild_engine.resolve_guilds()
         if not guilds:
             return 0, None
 
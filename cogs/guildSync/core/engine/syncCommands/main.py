@@ -2,18 +2,25 @@ from __future__ import annotations
 
 from typing import Awaitable, Callable, Dict, List, Optional, Tuple
 
+import asyncio
 import inspect
 
 import discord
 from discord.ext import commands
-from discord.app_commands import AppCommand
 
 from interface.logger import Logger
 from interface.commands import ROOT_COMMAND_GROUPS
+from cogs.guildSync.core.config.lib import flush_sync_hashes, get_setting
 
-from .modules.sync import GuildSynchroniser
+from .modules.flight import SingleFlight
+from .modules.keys import CommandKeyIndex
+from .modules.reconcile import PayloadAudit
+from .modules.scheduler import SyncScheduler, SyncTicket
+from .modules.sync import GuildSynchroniser, SyncedCommands
 
 ProgressCallback = Callable[[int, int, int, float, str], Optional[Awaitable[None]]]
+GuildSource = Callable[[], Dict[int, discord.Guild]]
+SyncObserver = Callable[[int, bool], None]
 
 class SyncCommandsEngine:
     def __init__(self, bot: commands.Bot) -> None:
@@ -22,20 +29,51 @@ class SyncCommandsEngine:
         self.synchroniser = GuildSynchroniser(bot, self.root_groups)
         self.cloner = self.synchroniser.cloner
         self.state = self.synchroniser.state
+        self.guild_source: Optional[GuildSource] = None
+        self.sync_observer: Optional[SyncObserver] = None
+        self.guild_flights = SingleFlight()
+        self.scheduler = SyncScheduler(
+            self,
+            debounce=float(get_setting("sync_debounce_seconds")),
+            max_delay=float(get_setting("sync_max_delay_seconds")),
+        )
+
+    def attach_guild_source(self, source: GuildSource) -> None:
+        """Provide every managed guild, used when a hybrid re-partition affects all of them."""
+        self.guild_source = source
+
+    def attach_sync_observer(self, observer: SyncObserver) -> None:
+        """Called with ``(guild_id, succeeded)`` after every per-guild sync attempt."""
+        self.sync_observer = observer
+
+    @staticmethod
+    def hybrid_enabled() -> bool:
+        return bool(get_setting("hybrid_registration"))
 
     async def desync_commands(self, guilds: List[discord.Guild]) -> None:
         if not guilds:
             return
 
-        await self.synchroniser.remove_global_commands()
+        if not self.hybrid_enabled():
+            await self.synchroniser.remove_global_commands()
         await self.synchroniser.desync_guilds(guilds)
+        flush_sync_hashes()
 
     def list_available_command_keys(self) -> List[Tuple[str, str]]:
         return self.cloner.list_available_keys(include_groups=True)
 
+    def get_command_key_index(self) -> CommandKeyIndex:
+        return self.cloner.key_index
+
     def expand_command_key(self, command_key: str) -> List[str]:
         return self.cloner.expand_key(command_key)
 
+    def invalidate_command_index(self) -> None:
+        self.cloner.invalidate_keys()
+        if self.synchroniser.dispatch.installed:
+            # Commands added by a reloaded extension need the scope check too.
+            self.synchroniser.dispatch.install()
+
     async def sync_selected_guilds(
         self,
         guilds: Dict[int, discord.Guild],
@@ -44,37 +82,62 @@ class SyncCommandsEngine:
         reset_snapshots: bool = False,
         include_progress: bool = False,
         progress_callback: ProgressCallback | None = None,
-    ) -> Dict[int, List[AppCommand]]:
+        max_concurrency: Optional[int] = None,
+    ) -> Dict[int, SyncedCommands]:
+        if self.synchroniser.dispatch.installed:
+            # Extensions loaded after this cog have added leaves that still lack the scope check.
+            self.synchroniser.dispatch.install()
+
         if not guilds:
             Logger.warning("SyncCommandsEngine -", "No guilds provided for command sync.")
             return {}
 
-        if clear_global:
+        if self.hybrid_enabled():
+            guilds = await self._sync_hybrid_globals(guilds, force=clear_global)
+        elif clear_global or self.synchroniser.global_roots:
             await self.synchroniser.remove_global_commands()
 
         if reset_snapshots:
             self.state.reset()
 
-        results: Dict[int, List[AppCommand]] = {}
+        self.synchroniser.scope_classes.clear()
+        scope_classes = self.synchroniser.scope_classes.partition(guilds.keys())
+        if len(guilds) > 1:
+            Logger.info(
+                "SyncCommandsEngine -",
+                f"Syncing {len(guilds)} guilds across {len(scope_classes)} distinct command sets.",
+            )
+
+        results: Dict[int, SyncedCommands] = {}
         total = len(guilds)
+        skips_before, pushes_before = self.state.payload_stats()
 
         progress_enabled = include_progress or progress_callback is not None
 
-        for index, (guild_id, guild) in enumerate(guilds.items(), start=1):
-            async def guild_progress(percent: float, message: str, *, idx=index, gid=guild_id) -> None:
+        workers = max_concurrency if max_concurrency is not None else get_setting("sync_workers")
+        workers = max(1, min(int(workers), total))
+
+        async def sync_one(index: int, guild_id: int, guild: discord.Guild) -> None:
+            async def guild_progress(percent: float, message: str) -> None:
                 if progress_callback is None:
                     return
 
-                outcome = progress_callback(idx, total, gid, percent, message)
+                outcome = progress_callback(index, total, guild_id, percent, message)
                 if inspect.isawaitable(outcome):
                     await outcome
 
-            synced = await self.synchroniser.sync_guild(
-                guild_id,
-                guild,
-                include_progress=progress_enabled,
-                progress_notifier=guild_progress if progress_callback is not None else None,
-            )
+            async def run_sync() -> Optional[SyncedCommands]:
+                return await self.synchroniser.sync_guild(
+                    guild_id,
+                    guild,
+                    include_progress=progress_enabled,
+                    progress_notifier=guild_progress if progress_callback is not None else None,
+                )
+
+            # Overlapping requests for the same guild share one run (plus at most one follow-up).
+            synced = await self.guild_flights.run(guild_id, run_sync)
+            if self.sync_observer is not None:
+                self.sync_observer(guild_id, synced is not None)
             if synced is not None:
                 results[guild_id] = synced
                 final_message = f"Completed sync for {guild.name} ({guild_id})."
@@ -86,6 +149,29 @@ class SyncCommandsEngine:
                 if synced is None or total > 1:
                     await guild_progress(100.0, final_message)
 
+        if workers == 1:
+            for index, (guild_id, guild) in enumerate(guilds.items(), start=1):
+                await sync_one(index, guild_id, guild)
+        else:
+            # discord.py's HTTP client paces the calls and waits out 429s, so wall
+            # time follows Discord's limits rather than the number of guilds.
+            semaphore = asyncio.Semaphore(workers)
+
+            async def worker(index: int, guild_id: int, guild: discord.Guild) -> None:
+                async with semaphore:
+                    await sync_one(index, guild_id, guild)
+
+            await asyncio.gather(
+                *(
+                    worker(index, guild_id, guild)
+                    for index, (guild_id, guild) in enumerate(guilds.items(), start=1)
+                )
+            )
+            results = {guild_id: results[guild_id] for guild_id in guilds if guild_id in results}
+
+        flush_sync_hashes()
+        self._log_payload_stats(skips_before, pushes_before)
+
         if not results:
             Logger.warning(
                 "SyncCommandsEngine -",
@@ -94,7 +180,77 @@ class SyncCommandsEngine:
 
         return results
 
-    async def sync_commands(self, guilds: Dict[int, discord.Guild]) -> Dict[int, List[AppCommand]]:
+    async def _sync_hybrid_globals(
+        self,
+        guilds: Dict[int, discord.Guild],
+        *,
+        force: bool,
+    ) -> Dict[int, discord.Guild]:
+        """Register unscoped root groups globally; returns the guilds that now need a sync."""
+        self.synchroniser.scope_classes.clear()
+        global_roots = self.synchroniser.scope_classes.unscoped_roots()
+        changed = global_roots != self.synchroniser.global_roots.keys()
+        if not (force or changed):
+            return guilds
+
+        await self.synchroniser.register_global_commands(global_roots)
+        if changed and self.guild_source is not None:
+            # A root moving between global and per-guild registration affects every guild.
+            return {**self.guild_source(), **guilds}
+        return guilds
+
+    async def audit_guilds(self, guild_ids: List[int]) -> Dict[int, PayloadAudit]:
+        """Compare each guild's remote commands with its local payload; issues GETs only."""
+        self.synchroniser.scope_classes.clear()
+        semaphore = asyncio.Semaphore(max(1, int(get_setting("sync_workers"))))
+        results: Dict[int, PayloadAudit] = {}
+
+        async def audit_one(guild_id: int) -> None:
+            async with semaphore:
+                results[guild_id] = await self.synchroniser.audit_guild(guild_id)
+
+        await asyncio.gather(*(audit_one(guild_id) for guild_id in guild_ids))
+        counts: Dict[str, int] = {}
+        for result in results.values():
+            counts[result.status] = counts.get(result.status, 0) + 1
+        summary = ", ".join(f"{count} {status.replace('_', ' ')}" for status, count in sorted(counts.items()))
+        Logger.info("SyncCommandsEngine -", f"Audited {len(results)} guilds: {summary or 'nothing to audit'}.")
+        return {guild_id: results[guild_id] for guild_id in guild_ids}
+
+    async def audit_global(self) -> PayloadAudit:
+        return await self.synchroniser.audit_global()
+
+    def _log_payload_stats(self, skips_before: int, pushes_before: int) -> None:
+        skips, pushes = self.state.payload_stats()
+        skipped = skips - skips_before
+        checked = skipped + (pushes - pushes_before)
+        if checked <= 0:
+            return
+
+        Logger.info(
+            "SyncCommandsEngine -",
+            f"Payload cache skipped {skipped} of {checked} guild syncs ({skipped / checked:.0%} hit rate).",
+        )
+
+    def schedule_sync(
+        self,
+        guilds: Dict[int, discord.Guild],
+        *,
+        clear_global: bool = False,
+        reset_snapshots: bool = False,
+    ) -> SyncTicket:
+        """Queue a debounced sync for ``guilds`` and return a ticket for the eventual result."""
+        return self.scheduler.schedule(
+            guilds,
+            clear_global=clear_global,
+            reset_snapshots=reset_snapshots,
+        )
+
+    async def shutdown(self) -> None:
+        await self.scheduler.stop()
+        self.synchroniser.dispatch.uninstall()
+
+    async def sync_commands(self, guilds: Dict[int, discord.Guild]) -> Dict[int, SyncedCommands]:
         return await self.sync_selected_guilds(
             guilds,
             clear_global=True,
@@ -107,4 +263,8 @@ class SyncCommandsEngine:
 
     def get_disabled_groups(self) -> Dict[int, List[str]]:
         return self.state.disabled_snapshot()
+
+    def get_payload_stats(self) -> Tuple[int, int]:
+        """Return ``(skipped, pushed)`` guild syncs since startup."""
+        return self.state.payload_stats()
         
\ No newline at end of file
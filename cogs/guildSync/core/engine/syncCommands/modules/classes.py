@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import AbstractSet, Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from discord import app_commands
+from discord.app_commands import Group
+
+from cogs.guildSync.core.config.lib import is_command_enabled_for_guild, is_command_scoped
+
+from .commands import CommandCloner
+from .payload import serialize_command
+
+
+Signature = FrozenSet[str]
+
+
+@dataclass
+class ScopeClass:
+    """Cloned root groups and their payload, shared by every guild with the same enabled commands."""
+
+    signature: Signature
+    clones: Dict[str, Optional[Group]]
+    payloads: Dict[str, Dict[str, Any]]
+
+    def is_clone(self, command: Any) -> bool:
+        clone = self.clones.get(getattr(command, "name", None))
+        return clone is not None and clone is command
+
+    def payload(self, exclude: AbstractSet[str] = frozenset()) -> List[Dict[str, Any]]:
+        return [payload for name, payload in self.payloads.items() if name not in exclude]
+
+
+class ScopeClassCache:
+    """Partition guilds by the scoped commands they have disabled and build each class once."""
+
+    def __init__(self, cloner: CommandCloner, tree: app_commands.CommandTree) -> None:
+        self.cloner = cloner
+        self.tree = tree
+        self._classes: Dict[Signature, ScopeClass] = {}
+        self._command_keys: Optional[Tuple[str, ...]] = None
+
+    def clear(self) -> None:
+        """Drop cached classes; call whenever scopes or the command tree may have changed."""
+        self._classes.clear()
+        self._command_keys = None
+
+    def _scoped_keys(self) -> Iterable[str]:
+        if self._command_keys is None:
+            self._command_keys = tuple(
+                self.cloner.command_key(command) for command in self.cloner.iter_commands()
+            )
+        return (key for key in self._command_keys if is_command_scoped(key))
+
+    def unscoped_roots(self) -> FrozenSet[str]:
+        """Names of root groups with commands, none of which has a scope entry."""
+        names = set()
+        for root_group in self.cloner.root_groups:
+            keys = [self.cloner.command_key(command) for command in self.cloner.iter_group_commands(root_group)]
+            if keys and not any(is_command_scoped(key) for key in keys):
+                names.add(root_group.name)
+        return frozenset(names)
+
+    def signature_for(self, guild_id: int) -> Signature:
+        # Unscoped commands are enabled everywhere, so only scoped keys can split guilds.
+        return frozenset(
+            key for key in self._scoped_keys() if not is_command_enabled_for_guild(key, guild_id)
+        )
+
+    def resolve(self, guild_id: int) -> ScopeClass:
+        signature = self.signature_for(guild_id)
+        scope_class = self._classes.get(signature)
+        if scope_class is None:
+            scope_class = self._build(signature, guild_id)
+            self._classes[signature] = scope_class
+        return scope_class
+
+    def partition(self, guild_ids: Iterable[int]) -> List[ScopeClass]:
+        seen: Dict[Signature, ScopeClass] = {}
+        for guild_id in guild_ids:
+            scope_class = self.resolve(guild_id)
+            seen.setdefault(scope_class.signature, scope_class)
+        return list(seen.values())
+
+    def _build(self, signature: Signature, representative_id: int) -> ScopeClass:
+        clones: Dict[str, Optional[Group]] = {}
+        for root_group in self.cloner.root_groups:
+            clones[root_group.name] = self.cloner.clone_group(root_group, representative_id)
+
+        payloads = {
+            name: serialize_command(clone, self.tree)
+            for name, clone in clones.items()
+            if clone is not None
+        }
+        return ScopeClass(signature=signature, clones=clones, payloads=payloads)
@@ -9,15 +9,22 @@ from discord.app_commands import AppCommand, Group
 from interface.logger import Logger
 from cogs.guildSync.core.config.lib import is_command_enabled_for_guild
 
+from .keys import CommandKeyIndex
+
 
 class CommandCloner:
     def __init__(self, root_groups: Iterable[Group]) -> None:
         self.root_groups = list(root_groups)
+        self._key_index: Optional[CommandKeyIndex] = None
 
     def iter_commands(self) -> Iterable[AppCommand]:
         for group in self.root_groups:
             yield from self._iter_commands(group)
 
+    def iter_group_commands(self, group: Group) -> Iterable[AppCommand]:
+        """Leaf commands nested anywhere below ``group``."""
+        return self._iter_commands(group)
+
     def iter_groups(self) -> Iterator[Group]:
         for group in self.root_groups:
             yield from self._iter_groups(group)
@@ -112,35 +119,51 @@ class CommandCloner:
 
         return clone if added else None
 
-    def list_available_keys(self, *, include_groups: bool = False) -> List[Tuple[str, str]]:
-        entries: List[Tuple[str, str]] = []
+    @property
+    def key_index(self) -> CommandKeyIndex:
+        if self._key_index is None:
+            self._key_index = self._build_key_index()
+        return self._key_index
+
+    def invalidate_keys(self) -> None:
+        """Drop the cached key index; call whenever extensions change the command tree."""
+        self._key_index = None
+
+    def _build_key_index(self) -> CommandKeyIndex:
+        group_entries: List[Tuple[str, str]] = []
+        command_entries: List[Tuple[str, str]] = []
+
+        def walk(group: Group) -> bool:
+            has_commands = False
+            for child in group.commands:
+                if isinstance(child, app_commands.Group):
+                    has_commands = walk(child) or has_commands
+                else:
+                    command_entries.append((self.command_key(child), self.format_label(child)))
+                    has_commands = True
+
+            # Skip groups that have no concrete commands beneath them.
+            if has_commands:
+                group_entries.append((f"{self.group_key(group)}.*", self.format_group_label(group)))
+            return has_commands
+
+        for group in self.root_groups:
+            walk(group)
+
+        return CommandKeyIndex(
+            group_entries + command_entries,
+            [key for key, _ in command_entries],
+        )
 
+    def list_available_keys(self, *, include_groups: bool = False) -> List[Tuple[str, str]]:
+        entries = self.key_index.pairs()
         if include_groups:
-            for group in self.iter_groups():
-                # Skip groups that have no concrete commands beneath them.
-                if not any(True for _ in self._iter_commands(group)):
-                    continue
-                key = f"{self.group_key(group)}.*"
-                label = self.format_group_label(group)
-                entries.append((key, label))
-
-        for command in self.iter_commands():
-            key = self.command_key(command)
-            label = self.format_label(command)
-            entries.append((key, label))
-
-        entries.sort(key=lambda item: item[0])
-        return entries
+            return entries
+        return [(key, label) for key, label in entries if not key.endswith(".*")]
 
     def expand_key(self, requested_key: str) -> List[str]:
         normalized = requested_key.replace(" ", ".").lower()
         if normalized.endswith(".*"):
-            prefix = normalized[:-2]
-            matches = []
-            for command in self.iter_commands():
-                key = self.command_key(command)
-                if key == prefix or key.startswith(f"{prefix}."):
-                    matches.append(key)
-            return sorted(set(matches))
+            return self.key_index.expand(normalized[:-2])
 
         return [normalized]
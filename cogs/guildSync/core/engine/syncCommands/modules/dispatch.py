@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from typing import AbstractSet, Any, Dict, Iterable, List
+
+import discord
+from discord import AppCommandType, app_commands
+from discord.app_commands import Group
+
+from cogs.guildSync.core.config.lib import is_command_enabled_for_guild, is_guild_configured
+
+from .commands import CommandCloner
+
+
+class SharedDispatch:
+    """Keep the original root groups resident once and gate each invocation by the scope index.
+
+    Guild payloads are uploaded directly, so the tree never holds per-guild
+    clones; interactions for those guild commands fall back to the shared
+    global hierarchy and are checked here instead.
+    """
+
+    def __init__(self, cloner: CommandCloner, tree: app_commands.CommandTree) -> None:
+        self.cloner = cloner
+        self.tree = tree
+        self._roots: Dict[str, Group] = {group.name: group for group in cloner.root_groups}
+        # Root groups also uploaded as global commands (hybrid mode); usable outside managed guilds.
+        self.global_roots: AbstractSet[str] = frozenset()
+        self.installed = False
+
+    @property
+    def root_names(self) -> AbstractSet[str]:
+        return self._roots.keys()
+
+    def is_shared(self, command: Any) -> bool:
+        return self._roots.get(getattr(command, "name", None)) is command
+
+    def install(self) -> None:
+        """Register the shared roots and check every leaf; safe to repeat after extensions add commands."""
+        for group in self._roots.values():
+            if self.tree.get_command(group.name, type=AppCommandType.chat_input) is not group:
+                self.tree.add_command(group, override=True)
+        for command in self._leaf_commands():
+            if self._check not in command.checks:
+                command.add_check(self._check)
+        self.installed = True
+
+    def uninstall(self) -> None:
+        if not self.installed:
+            return
+
+        for group in self._roots.values():
+            if self.tree.get_command(group.name, type=AppCommandType.chat_input) is group:
+                self.tree.remove_command(group.name, type=AppCommandType.chat_input)
+        for command in self._leaf_commands():
+            command.remove_check(self._check)
+        self.installed = False
+
+    def _leaf_commands(self) -> Iterable[app_commands.Command]:
+        return list(self.cloner.iter_commands())
+
+    async def _check(self, interaction: discord.Interaction) -> bool:
+        command = interaction.command
+        if command is None:
+            return True
+
+        if self._allows(self.cloner.command_key(command), command.root_parent, interaction.guild_id):
+            return True
+
+        if not interaction.response.is_done():
+            await interaction.response.send_message("This command is not enabled in this server.", ephemeral=True)
+        return False
+
+    def _allows(self, command_key: str, root: Any, guild_id: int | None) -> bool:
+        root_name = getattr(root, "name", None)
+        if root_name in self.global_roots:
+            # Global roots are unscoped, so every guild (and DMs) may use them.
+            return guild_id is None or is_command_enabled_for_guild(command_key, guild_id)
+        if guild_id is None or not is_guild_configured(guild_id):
+            return False
+        return is_command_enabled_for_guild(command_key, guild_id)
+
+    def global_extras(self) -> List[Any]:
+        """Global tree commands other than the shared roots."""
+        return [command for command in self.tree.get_commands() if not self.is_shared(command)]
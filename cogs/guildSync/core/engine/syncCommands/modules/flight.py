@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+Runner = Callable[[], Awaitable[Any]]
+
+
+@dataclass
+class _Flight:
+    runner: Runner
+    task: Optional["asyncio.Task[Any]"] = None
+    started: bool = False
+    rerun: bool = False
+
+
+class SingleFlight:
+    """Collapse overlapping runs per key.
+
+    Callers that arrive before a run starts simply join it. Callers that arrive
+    while it is running request a follow-up; any number of them share exactly one
+    follow-up run, and everyone receives the result of the last run.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, _Flight] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def run(self, key: Hashable, runner: Runner) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(runner=runner)
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._drive(key, flight))
+        else:
+            # The newest request carries the freshest progress hooks.
+            flight.runner = runner
+            if flight.started:
+                flight.rerun = True
+
+        assert flight.task is not None
+        return await asyncio.shield(flight.task)
+
+    async def _drive(self, key: Hashable, flight: _Flight) -> Any:
+        try:
+            while True:
+                flight.started = True
+                flight.rerun = False
+                result = await flight.runner()
+                if not flight.rerun:
+                    return result
+        finally:
+            self._flights.pop(key, None)
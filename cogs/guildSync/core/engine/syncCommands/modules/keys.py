@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class KeyEntry:
+    key: str
+    label: str
+    # ``"<label> (<key>)"``, as shown in autocomplete.
+    display: str
+
+
+class _TrieNode:
+    __slots__ = ("children", "lo", "hi")
+
+    def __init__(self, lo: int) -> None:
+        self.children: Dict[str, _TrieNode] = {}
+        self.lo = lo
+        self.hi = lo
+
+
+class _PrefixTrie:
+    """Character trie over sorted keys; each node stores the ``[lo, hi)`` range of keys below it."""
+
+    def __init__(self, keys: Sequence[str]) -> None:
+        self.root = _TrieNode(0)
+        self.root.hi = len(keys)
+        for index, key in enumerate(keys):
+            node = self.root
+            for char in key:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _TrieNode(index)
+                child.hi = index + 1
+                node = child
+
+    def range(self, prefix: str) -> Tuple[int, int]:
+        node: Optional[_TrieNode] = self.root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return 0, 0
+        return node.lo, node.hi
+
+
+class CommandKeyIndex:
+    """Sorted command keys and labels, built once per command tree shape."""
+
+    def __init__(self, entries: List[Tuple[str, str]], command_keys: List[str]) -> None:
+        self.entries = [
+            KeyEntry(key, label, f"{label} ({key})")
+            for key, label in sorted(entries, key=lambda item: item[0])
+        ]
+        self.command_keys = sorted(set(command_keys))
+        self._command_set = frozenset(self.command_keys)
+        self._command_trie = _PrefixTrie(self.command_keys)
+
+    def pairs(self) -> List[Tuple[str, str]]:
+        return [(entry.key, entry.label) for entry in self.entries]
+
+    def expand(self, prefix: str) -> List[str]:
+        """Command keys equal to ``prefix`` or nested below it."""
+        lo, hi = self._command_trie.range(f"{prefix}.")
+        matches = self.command_keys[lo:hi]
+        if prefix in self._command_set:
+            matches = [prefix, *matches]
+        return matches
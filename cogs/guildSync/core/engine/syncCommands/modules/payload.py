@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List
+
+from discord import app_commands
+
+
+def serialize_command(command: Any, tree: app_commands.CommandTree) -> Dict[str, Any]:
+    """Build the payload discord.py would upload for ``command``."""
+    try:
+        return command.to_dict(tree)
+    except TypeError:
+        # discord.py < 2.4 does not take the tree argument.
+        return command.to_dict()
+
+
+def serialize_commands(commands: Iterable[Any], tree: app_commands.CommandTree) -> List[Dict[str, Any]]:
+    return [serialize_command(command, tree) for command in commands]
+
+
+def payload_digest(payload: Iterable[Dict[str, Any]]) -> str:
+    """Return a stable hash for a command payload regardless of registration order."""
+    entries = sorted(
+        payload,
+        key=lambda item: (int(item.get("type", 1)), str(item.get("name", ""))),
+    )
+    encoded = json.dumps(entries, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+IN_SYNC = "in_sync"
+DRIFTED = "drifted"
+MISSING = "missing"
+# The remote commands could not be fetched.
+UNKNOWN = "unknown"
+
+_COMMAND_FIELDS = (
+    "type",
+    "name",
+    "description",
+    "options",
+    "default_member_permissions",
+    "dm_permission",
+    "nsfw",
+    "contexts",
+    "integration_types",
+)
+_OPTION_FIELDS = (
+    "type",
+    "name",
+    "description",
+    "required",
+    "choices",
+    "options",
+    "channel_types",
+    "min_value",
+    "max_value",
+    "min_length",
+    "max_length",
+    "autocomplete",
+)
+_CHOICE_FIELDS = ("name", "value")
+# Values Discord treats the same as an omitted field.
+_DEFAULTS: Dict[str, Any] = {
+    "dm_permission": True,
+    "nsfw": False,
+    "required": False,
+    "autocomplete": False,
+    "integration_types": [0],
+}
+_UNORDERED = frozenset({"contexts", "integration_types", "channel_types"})
+
+CommandId = Tuple[int, str]
+
+
+def _normalize(entry: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+    normalized: Dict[str, Any] = {}
+    for name in fields:
+        value = entry.get(name)
+        if value is None or value == "" or value == [] or value == {}:
+            continue
+        if name in _UNORDERED:
+            value = sorted(value)
+        if _DEFAULTS.get(name, ...) == value:
+            continue
+        if name == "options":
+            value = [_normalize(option, _OPTION_FIELDS) for option in value]
+        elif name == "choices":
+            value = [_normalize(choice, _CHOICE_FIELDS) for choice in value]
+        elif name == "default_member_permissions":
+            value = str(value)
+        normalized[name] = value
+    return normalized
+
+
+def normalize_payload(payload: Iterable[Dict[str, Any]]) -> Dict[CommandId, Dict[str, Any]]:
+    """Key commands by ``(type, name)`` and keep only the fields Discord stores for them.
+
+    Server-assigned fields (ids, versions) and fields left at Discord's
+    default are dropped, so a local payload and a fetched one compare equal
+    when Discord would treat them the same. Localizations are ignored because
+    the list endpoints omit them by default.
+    """
+    return {
+        (int(entry.get("type", 1)), str(entry.get("name", ""))): _normalize(entry, _COMMAND_FIELDS)
+        for entry in payload
+    }
+
+
+@dataclass
+class PayloadAudit:
+    """How the commands registered on Discord compare to the local payload for one scope."""
+
+    guild_id: Optional[int]
+    status: str
+    # Command names only present locally, only present remotely, or present on both with a different shape.
+    missing: List[str] = field(default_factory=list)
+    unexpected: List[str] = field(default_factory=list)
+    changed: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def in_sync(self) -> bool:
+        return self.status == IN_SYNC
+
+
+def compare_payloads(
+    guild_id: Optional[int],
+    local: Iterable[Dict[str, Any]],
+    remote: Iterable[Dict[str, Any]],
+) -> PayloadAudit:
+    expected = normalize_payload(local)
+    actual = normalize_payload(remote)
+
+    missing = sorted(key[1] for key in expected if key not in actual)
+    unexpected = sorted(key[1] for key in actual if key not in expected)
+    changed = sorted(key[1] for key, value in expected.items() if key in actual and actual[key] != value)
+
+    if not (missing or unexpected or changed):
+        status = IN_SYNC
+    elif expected and not actual:
+        status = MISSING
+    else:
+        status = DRIFTED
+    return PayloadAudit(guild_id, status, missing, unexpected, changed)
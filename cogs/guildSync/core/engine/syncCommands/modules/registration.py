@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import discord
+from discord import AppCommandType, app_commands
+from discord.app_commands import Group
+from discord.ext import commands
+
+from cogs.guildSync.core.config.lib import get_setting
+
+from .classes import ScopeClass
+from .commands import CommandCloner
+from .dispatch import SharedDispatch
+from .payload import serialize_command, serialize_commands
+
+
+Payload = List[Dict[str, Any]]
+
+
+def _command_id(command: Any) -> Tuple[str, AppCommandType]:
+    return command.name, getattr(command, "type", AppCommandType.chat_input)
+
+
+class CommandRegistration(ABC):
+    """How root clones are registered and how guild and global payloads reach Discord."""
+
+    def __init__(self, bot: commands.Bot, cloner: CommandCloner, dispatch: SharedDispatch) -> None:
+        self.bot = bot
+        self.tree = bot.tree
+        self.cloner = cloner
+        self.dispatch = dispatch
+        self._root_ids = {(group.name, AppCommandType.chat_input) for group in cloner.root_groups}
+
+    @abstractmethod
+    def register_global_roots(self, clones: Mapping[str, Group]) -> None:
+        """Make ``clones`` the only root groups registered as global commands."""
+
+    @abstractmethod
+    def global_payload(self, global_roots: Mapping[str, Group]) -> Payload:
+        ...
+
+    @abstractmethod
+    def unregister_guild_roots(self, guild_id: int) -> bool:
+        """Drop the root clones held for ``guild_id``; returns whether any were registered."""
+
+    @abstractmethod
+    def register_guild_root(self, guild_id: int, clone: Group) -> None:
+        ...
+
+    @abstractmethod
+    def guild_payload(
+        self,
+        guild_id: int,
+        scope_class: ScopeClass,
+        global_roots: Mapping[str, Group],
+    ) -> Tuple[Payload, List[Any]]:
+        """Payload for ``guild_id`` once its roots are registered, and the local commands it is built from."""
+
+    async def push(self, guild_id: Optional[int], payload: Payload) -> int:
+        """Overwrite the commands of ``guild_id`` (or the global scope); returns how many Discord now holds."""
+        application_id = self.bot.application_id
+        if application_id is None:
+            raise app_commands.MissingApplicationID
+
+        # Uploaded as-is so a scope class's shared payload is not serialized again per guild.
+        http = self.bot.http
+        if guild_id is None:
+            return len(await http.bulk_upsert_global_commands(application_id, payload=payload))
+        return len(await http.bulk_upsert_guild_commands(application_id, guild_id, payload=payload))
+
+    def guild_extras(self, guild_id: int) -> List[Any]:
+        """Commands other cogs registered for ``guild_id``, plus the global ones when they are copied in."""
+        guild_obj = discord.Object(id=guild_id)
+        extras = {
+            _command_id(command): command
+            for command in self.tree.get_commands(guild=guild_obj)
+            # Root clones are owned by the synchroniser and come from the scope class instead.
+            if _command_id(command) not in self._root_ids
+        }
+        if not get_setting("hybrid_registration"):
+            # Same precedence as ``copy_global_to``: globals replace guild commands of the same name.
+            for command in self.dispatch.global_extras():
+                extras[_command_id(command)] = command
+        return list(extras.values())
+
+    def desired_payload(
+        self,
+        guild_id: int,
+        scope_class: ScopeClass,
+        global_roots: Mapping[str, Group],
+    ) -> Tuple[Payload, List[Any]]:
+        """Desired payload for ``guild_id`` and the local commands it is built from, without touching the tree."""
+        roots = [
+            clone
+            for name, clone in scope_class.clones.items()
+            if clone is not None and name not in global_roots
+        ]
+        extras = self.guild_extras(guild_id)
+        payload = scope_class.payload(exclude=global_roots.keys()) + serialize_commands(extras, self.tree)
+        return payload, roots + extras
+
+
+class TreeRegistration(CommandRegistration):
+    """Add per-guild clones to the command tree so it dispatches them; payloads are uploaded directly."""
+
+    def register_global_roots(self, clones: Mapping[str, Group]) -> None:
+        for group in self.cloner.root_groups:
+            self.tree.remove_command(group.name, type=AppCommandType.chat_input)
+        for clone in clones.values():
+            self.tree.add_command(clone)
+
+    def global_payload(self, global_roots: Mapping[str, Group]) -> Payload:
+        return serialize_commands(self.tree.get_commands(), self.tree)
+
+    def unregister_guild_roots(self, guild_id: int) -> bool:
+        guild_obj = discord.Object(id=guild_id)
+        removed = [
+            self.tree.remove_command(group.name, type=AppCommandType.chat_input, guild=guild_obj)
+            for group in self.cloner.root_groups
+        ]
+        return any(command is not None for command in removed)
+
+    def register_guild_root(self, guild_id: int, clone: Group) -> None:
+        self.tree.add_command(clone, guild=discord.Object(id=guild_id), override=True)
+
+    def guild_payload(
+        self,
+        guild_id: int,
+        scope_class: ScopeClass,
+        global_roots: Mapping[str, Group],
+    ) -> Tuple[Payload, List[Any]]:
+        guild_obj = discord.Object(id=guild_id)
+        if not get_setting("hybrid_registration"):
+            # In hybrid mode the global tree is synced globally; copying it would duplicate it.
+            self.tree.copy_global_to(guild=guild_obj)
+
+        local_commands = self.tree.get_commands(guild=guild_obj)
+        # Root clones are serialized once per scope class; only commands other cogs
+        # registered for this guild (or copied from the global tree) are serialized here.
+        extras = [command for command in local_commands if not scope_class.is_clone(command)]
+        payload = scope_class.payload(exclude=global_roots.keys()) + serialize_commands(extras, self.tree)
+        return payload, local_commands
+
+
+class DirectRegistration(CommandRegistration):
+    """Upload per-guild payloads directly; the tree only keeps the shared roots for dispatch.
+
+    Interactions for guild commands fall back to the shared global hierarchy,
+    which ``SharedDispatch`` gates by the scope index.
+    """
+
+    def __init__(self, bot: commands.Bot, cloner: CommandCloner, dispatch: SharedDispatch) -> None:
+        super().__init__(bot, cloner, dispatch)
+        dispatch.install()
+
+    def register_global_roots(self, clones: Mapping[str, Group]) -> None:
+        pass
+
+    def global_payload(self, global_roots: Mapping[str, Group]) -> Payload:
+        # The shared roots are resident for dispatch only; hybrid roots are uploaded from their clones.
+        return serialize_commands(self.dispatch.global_extras(), self.tree) + [
+            serialize_command(clone, self.tree) for clone in global_roots.values()
+        ]
+
+    def unregister_guild_roots(self, guild_id: int) -> bool:
+        return False
+
+    def register_guild_root(self, guild_id: int, clone: Group) -> None:
+        pass
+
+    def guild_payload(
+        self,
+        guild_id: int,
+        scope_class: ScopeClass,
+        global_roots: Mapping[str, Group],
+    ) -> Tuple[Payload, List[Any]]:
+        return self.desired_payload(guild_id, scope_class, global_roots)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional
+
+import discord
+
+from interface.logger import Logger
+
+if TYPE_CHECKING:
+    from cogs.guildSync.core.engine.syncCommands.main import SyncCommandsEngine
+
+
+_RECENT_TICKETS = 50
+
+
+@dataclass
+class SyncTicket:
+    """Handle for a queued sync; poll ``status`` or ``await wait()``."""
+
+    id: int
+    guild_ids: FrozenSet[int]
+    future: "asyncio.Future[Dict[int, Any]]"
+    status: str = "pending"
+    error: Optional[str] = None
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    async def wait(self) -> Dict[int, Any]:
+        return await asyncio.shield(self.future)
+
+
+@dataclass
+class _PendingBatch:
+    guilds: Dict[int, discord.Guild] = field(default_factory=dict)
+    tickets: List[SyncTicket] = field(default_factory=list)
+    clear_global: bool = False
+    reset_snapshots: bool = False
+    first_enqueued: float = 0.0
+    last_enqueued: float = 0.0
+
+
+class SyncScheduler:
+    """Debounce sync requests and run one sync per dirty guild for each burst."""
+
+    def __init__(self, engine: "SyncCommandsEngine", *, debounce: float, max_delay: float) -> None:
+        self.engine = engine
+        self.debounce = max(0.0, debounce)
+        self.max_delay = max(self.debounce, max_delay)
+        self._pending = _PendingBatch()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+        self._ids = itertools.count(1)
+        self._tickets: "OrderedDict[int, SyncTicket]" = OrderedDict()
+        # Tickets of the batch currently being synced.
+        self._running: List[SyncTicket] = []
+
+    def schedule(
+        self,
+        guilds: Dict[int, discord.Guild],
+        *,
+        clear_global: bool = False,
+        reset_snapshots: bool = False,
+    ) -> SyncTicket:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        pending = self._pending
+        if not pending.tickets:
+            pending.first_enqueued = now
+        pending.last_enqueued = now
+        pending.guilds.update(guilds)
+        pending.clear_global = pending.clear_global or clear_global
+        pending.reset_snapshots = pending.reset_snapshots or reset_snapshots
+
+        ticket = SyncTicket(
+            id=next(self._ids),
+            guild_ids=frozenset(guilds),
+            future=loop.create_future(),
+        )
+        pending.tickets.append(ticket)
+        self._remember(ticket)
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wake.set()
+        return ticket
+
+    def get_ticket(self, ticket_id: int) -> Optional[SyncTicket]:
+        return self._tickets.get(ticket_id)
+
+    def recent_tickets(self) -> List[SyncTicket]:
+        return list(reversed(self._tickets.values()))
+
+    def pending_guild_ids(self) -> FrozenSet[int]:
+        return frozenset(self._pending.guilds)
+
+    async def stop(self) -> None:
+        """Cancel the worker and every ticket still queued or running, so no waiter hangs."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        tickets = self._running + self._pending.tickets
+        self._running = []
+        self._pending = _PendingBatch()
+        for ticket in tickets:
+            if ticket.future.done():
+                continue
+            ticket.status = "cancelled"
+            ticket.error = "Sync scheduler stopped before the sync finished."
+            ticket.future.cancel()
+
+    def _remember(self, ticket: SyncTicket) -> None:
+        self._tickets[ticket.id] = ticket
+        while len(self._tickets) > _RECENT_TICKETS:
+            self._tickets.popitem(last=False)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wake.wait()
+
+            # Wait until the burst goes quiet, but never past max_delay from its first request.
+            while True:
+                pending = self._pending
+                deadline = min(
+                    pending.last_enqueued + self.debounce,
+                    pending.first_enqueued + self.max_delay,
+                )
+                delay = deadline - loop.time()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+
+            self._wake.clear()
+            batch, self._pending = self._pending, _PendingBatch()
+            if not batch.tickets:
+                continue
+
+            await self._execute(batch)
+
+    async def _execute(self, batch: _PendingBatch) -> None:
+        self._running = batch.tickets
+        for ticket in batch.tickets:
+            ticket.status = "running"
+
+        if len(batch.tickets) > 1:
+            Logger.info(
+                "SyncCommandsEngine -",
+                f"Coalesced {len(batch.tickets)} sync requests into one run for {len(batch.guilds)} guilds.",
+            )
+
+        try:
+            results = await self.engine.sync_selected_guilds(
+                batch.guilds,
+                clear_global=batch.clear_global,
+                reset_snapshots=batch.reset_snapshots,
+                include_progress=False,
+                progress_callback=None,
+            )
+        except Exception as exc:  # noqa: BLE001
+            Logger.error("SyncCommandsEngine -", f"Scheduled sync failed: {exc}")
+            for ticket in batch.tickets:
+                ticket.status = "failed"
+                ticket.error = str(exc)
+                if not ticket.future.done():
+                    ticket.future.set_result({})
+            self._running = []
+            return
+
+        self._running = []
+
+        for ticket in batch.tickets:
+            ticket.status = "completed"
+            if not ticket.future.done():
+                ticket.future.set_result(
+                    {guild_id: results[guild_id] for guild_id in ticket.guild_ids if guild_id in results}
+                )
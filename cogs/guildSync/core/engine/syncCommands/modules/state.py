@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 
 @dataclass
@@ -13,6 +13,8 @@ class GuildSyncState:
 @dataclass
 class SyncState:
     guilds: Dict[int, GuildSyncState] = field(default_factory=dict)
+    payload_skips: int = 0
+    payload_pushes: int = 0
 
     def update_guild(self, guild_id: int, labels: List[str], disabled: List[str]) -> None:
         self.guilds[guild_id] = GuildSyncState(labels, disabled)
@@ -28,3 +30,12 @@ class SyncState:
 
     def disabled_snapshot(self) -> Dict[int, List[str]]:
         return {gid: list(state.disabled_groups) for gid, state in self.guilds.items()}
+
+    def record_payload_check(self, skipped: bool) -> None:
+        if skipped:
+            self.payload_skips += 1
+        else:
+            self.payload_pushes += 1
+
+    def payload_stats(self) -> Tuple[int, int]:
+        return self.payload_skips, self.payload_pushes
@@ -2,22 +2,30 @@ from __future__ import annotations
 
 import asyncio
 from contextlib import suppress
-from typing import Awaitable, Callable, Dict, Iterable, List, Optional
+from typing import AbstractSet, Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
 
 import inspect
 
 import discord
 from discord.ext import commands
 from discord import AppCommandType, app_commands
-from discord.app_commands import AppCommand, Group
+from discord.app_commands import Group
 
 from interface.logger import Logger
+from cogs.guildSync.core.config.lib import clear_sync_hash, get_setting, get_sync_hash, set_sync_hash
 
+from .classes import ScopeClassCache
 from .commands import CommandCloner
+from .dispatch import SharedDispatch
+from .payload import payload_digest, serialize_commands
+from .registration import CommandRegistration, DirectRegistration, TreeRegistration
+from .reconcile import PayloadAudit, UNKNOWN, compare_payloads
 from .state import SyncState
 
 
 ProgressNotifier = Callable[[float, str], Optional[Awaitable[None]]]
+# Local commands registered for a guild once Discord holds its payload.
+SyncedCommands = List[Union[app_commands.Command, Group, app_commands.ContextMenu]]
 
 
 class GuildSynchroniser:
@@ -28,49 +36,189 @@ class GuildSynchroniser:
         self.tree = bot.tree
         self.cloner = CommandCloner(root_groups)
         self.state = SyncState()
+        self.scope_classes = ScopeClassCache(self.cloner, self.tree)
+        # Root groups currently registered once as global commands (hybrid mode).
+        self.global_roots: Dict[str, Group] = {}
+        self.dispatch = SharedDispatch(self.cloner, self.tree)
+        # Stateless mode uploads per-guild payloads directly and never adds clones to the tree.
+        registration = DirectRegistration if get_setting("stateless_dispatch") else TreeRegistration
+        self.registration: CommandRegistration = registration(bot, self.cloner, self.dispatch)
+        # Reconcile mode compares against the commands Discord reports instead of trusting the stored hash.
+        self.reconcile = bool(get_setting("sync_reconcile"))
+
+    async def fetch_remote(self, guild_id: Optional[int]) -> List[Dict[str, Any]]:
+        """Raw command payloads Discord currently holds for ``guild_id`` (or the global scope)."""
+        application_id = self.bot.application_id
+        if application_id is None:
+            raise app_commands.MissingApplicationID
+
+        # discord.py's HTTP client waits out and retries 429s itself.
+        if guild_id is None:
+            return list(await self.bot.http.get_global_commands(application_id))
+        return list(await self.bot.http.get_guild_commands(application_id, guild_id))
+
+    async def audit(self, guild_id: Optional[int], payload: List[Dict[str, Any]]) -> PayloadAudit:
+        """Compare ``payload`` with what Discord holds; fetch failures yield an ``unknown`` audit."""
+        try:
+            remote = await self.fetch_remote(guild_id)
+        except discord.DiscordException as exc:
+            scope = "global commands" if guild_id is None else f"commands for guild {guild_id}"
+            Logger.warning("SyncCommandsEngine -", f"Failed to fetch {scope}: {exc}")
+            return PayloadAudit(guild_id, UNKNOWN, error=str(exc))
+        return compare_payloads(guild_id, payload, remote)
+
+    async def audit_guild(self, guild_id: int) -> PayloadAudit:
+        scope_class = self.scope_classes.resolve(guild_id)
+        payload, _ = self.registration.desired_payload(guild_id, scope_class, self.global_roots)
+        return await self.audit(guild_id, payload)
+
+    async def audit_global(self) -> PayloadAudit:
+        return await self.audit(None, self.registration.global_payload(self.global_roots))
+
+    async def _payload_current(
+        self,
+        guild_id: Optional[int],
+        payload: List[Dict[str, Any]],
+        digest: str,
+        *,
+        fetch_unknown: bool = False,
+    ) -> bool:
+        """Whether Discord already holds ``payload``, by reconciling or by the stored hash.
+
+        With ``fetch_unknown`` a missing hash is resolved with a GET instead of
+        assuming the remote side differs.
+        """
+        stored = get_sync_hash(guild_id)
+        if self.reconcile or (fetch_unknown and stored is None):
+            result = await self.audit(guild_id, payload)
+            if result.status != UNKNOWN:
+                return result.in_sync
+        return digest == stored
+
+    async def _remote_has_roots(self, guild_id: int) -> Optional[bool]:
+        """Whether Discord still holds any of the root groups for ``guild_id``; ``None`` if the fetch failed."""
+        try:
+            remote = await self.fetch_remote(guild_id)
+        except discord.DiscordException:
+            return None
+        root_names = self.dispatch.root_names
+        return any(
+            int(entry.get("type", 1)) == AppCommandType.chat_input.value and entry.get("name") in root_names
+            for entry in remote
+        )
 
     async def remove_global_commands(self) -> None:
-        for group in self.cloner.root_groups:
-            self.tree.remove_command(group.name, type=AppCommandType.chat_input)
+        self.registration.register_global_roots({})
+        self.global_roots = {}
+        self.dispatch.global_roots = frozenset()
+
+        payload = self.registration.global_payload(self.global_roots)
+        digest = payload_digest(payload)
+        # Nothing of ours is registered globally, or the remaining global commands are unchanged.
+        if await self._payload_current(None, payload, digest, fetch_unknown=True):
+            set_sync_hash(None, digest)
+            Logger.info("SyncCommandsEngine -", "Global commands already match; skipped global removal.")
+            return
+
         try:
-            await self.tree.sync()
+            await self.registration.push(None, payload)
         except discord.DiscordException as exc:
             Logger.warning(
                 "SyncCommandsEngine -",
                 f"Failed to sync global command removal: {exc}",
             )
+        else:
+            set_sync_hash(None, digest)
+
+    async def register_global_commands(self, root_names: AbstractSet[str]) -> bool:
+        """Register ``root_names`` once as global commands and sync the global tree if it changed."""
+        registered: Dict[str, Group] = {}
+        for root_group in self.cloner.root_groups:
+            if root_group.name not in root_names:
+                continue
+
+            # Unscoped roots are enabled for every guild, so any id yields the full clone.
+            clone = self.cloner.clone_group(root_group, 0)
+            if clone is not None:
+                registered[root_group.name] = clone
+
+        self.registration.register_global_roots(registered)
+        self.global_roots = registered
+        self.dispatch.global_roots = frozenset(registered)
+        payload = self.registration.global_payload(self.global_roots)
+        digest = payload_digest(payload)
+        if await self._payload_current(None, payload, digest, fetch_unknown=True):
+            set_sync_hash(None, digest)
+            Logger.info("SyncCommandsEngine -", "Global command payload unchanged; skipped global sync.")
+            return True
+
+        try:
+            await self.registration.push(None, payload)
+        except discord.DiscordException as exc:
+            Logger.warning(
+                "SyncCommandsEngine -",
+                f"Failed to sync global commands: {exc}",
+            )
+            return False
+
+        set_sync_hash(None, digest)
+        names = ", ".join(sorted(registered)) or "(none)"
+        Logger.success("SyncCommandsEngine -", f"Registered global command groups: {names}.")
+        return True
 
     async def desync_guilds(self, guilds: List[discord.Guild]) -> None:
+        """Clear the root groups from ``guilds`` concurrently and log one summary."""
         if not guilds:
             return
 
-        for guild in guilds:
-            guild_obj = discord.Object(id=guild.id)
-            removed_any = False
-            for group in self.cloner.root_groups:
-                removed = self.tree.remove_command(
-                    group.name,
-                    type=AppCommandType.chat_input,
-                    guild=guild_obj,
-                )
-                removed_any = removed_any or removed is not None
+        workers = max(1, min(int(get_setting("sync_workers")), len(guilds)))
+        semaphore = asyncio.Semaphore(workers)
+        outcomes: Dict[str, List[discord.Guild]] = {"cleared": [], "clean": [], "failed": []}
+        errors: Dict[int, str] = {}
 
-            if not removed_any:
-                continue
+        async def desync_one(guild: discord.Guild) -> None:
+            async with semaphore:
+                try:
+                    outcome = await self._desync_guild(guild)
+                except discord.DiscordException as exc:
+                    outcome = "failed"
+                    errors[guild.id] = str(exc)
+            outcomes[outcome].append(guild)
 
-            try:
-                await self.tree.sync(guild=guild_obj)
-            except discord.DiscordException as exc:
-                Logger.warning(
-                    "SyncCommandsEngine -",
-                    f"Failed to desync commands for {guild.name} ({guild.id}): {exc}",
-                )
-            else:
-                Logger.info(
-                    "SyncCommandsEngine -",
-                    f"Desynced commands from {guild.name} ({guild.id}).",
-                )
-                self.state.remove_guild(guild.id)
+        await asyncio.gather(*(desync_one(guild) for guild in guilds))
+
+        cleared, clean, failed = outcomes["cleared"], outcomes["clean"], outcomes["failed"]
+        Logger.info(
+            "SyncCommandsEngine -",
+            f"Desynced {len(guilds)} guilds: {len(cleared)} cleared, {len(clean)} already clean, {len(failed)} failed.",
+        )
+        if failed:
+            names = ", ".join(
+                f"{guild.name} ({guild.id}): {errors.get(guild.id, 'remote state unknown')}" for guild in failed[:10]
+            )
+            more = f" and {len(failed) - 10} more" if len(failed) > 10 else ""
+            Logger.warning("SyncCommandsEngine -", f"Failed to desync {names}{more}; they may keep stale commands.")
+
+    async def _desync_guild(self, guild: discord.Guild) -> str:
+        # A stored hash means a payload was pushed; stateless syncs leave nothing in the tree.
+        known = self.registration.unregister_guild_roots(guild.id) or get_sync_hash(guild.id) is not None
+
+        needs_clear: Optional[bool] = True
+        if self.reconcile or not known:
+            # Local state can be stale (another process, a lost hash file), so ask Discord.
+            needs_clear = await self._remote_has_roots(guild.id)
+            if needs_clear is None:
+                if not known:
+                    return "failed"
+                needs_clear = True
+
+        if needs_clear:
+            extras = serialize_commands(self.registration.guild_extras(guild.id), self.tree)
+            await self.registration.push(guild.id, extras)
+
+        self.state.remove_guild(guild.id)
+        clear_sync_hash(guild.id)
+        return "cleared" if needs_clear else "clean"
 
     async def sync_guild(
         self,
@@ -79,9 +227,7 @@ class GuildSynchroniser:
         *,
         include_progress: bool,
         progress_notifier: ProgressNotifier | None = None,
-    ) -> Optional[List[AppCommand]]:
-        guild_obj = discord.Object(id=guild_id)
-
+    ) -> Optional[SyncedCommands]:
         async def notify(percent: float, message: str) -> None:
             if progress_notifier is None:
                 return
@@ -94,44 +240,28 @@ class GuildSynchroniser:
 
         enabled_groups: List[str] = []
         disabled_groups: List[str] = []
-        tree = self.tree
 
         total_steps = max(1, len(self.cloner.root_groups)) + 1
         current_step = 0
+        scope_class = self.scope_classes.resolve(guild_id)
 
+        self.registration.unregister_guild_roots(guild_id)
         for root_group in self.cloner.root_groups:
-            tree.remove_command(root_group.name, type=AppCommandType.chat_input, guild=guild_obj)
-
-            clone = self.cloner.clone_group(root_group, guild_id)
+            clone = scope_class.clones.get(root_group.name)
             stage_message: str
 
-            if clone is None:
+            if root_group.name in self.global_roots:
+                stage_message = (
+                    f"Group '{root_group.name}' is registered globally; skipped for {guild.name} ({guild_id})."
+                )
+            elif clone is None:
                 disabled_groups.append(root_group.name)
                 stage_message = (
                     f"Group '{root_group.name}' disabled for {guild.name} ({guild_id})."
                 )
             else:
-                added_successfully = False
                 try:
-                    tree.add_command(clone, guild=guild_obj)
-                except app_commands.AppCommandAlreadyRegistered:
-                    tree.remove_command(root_group.name, type=AppCommandType.chat_input, guild=guild_obj)
-                    try:
-                        tree.add_command(clone, guild=guild_obj)
-                    except discord.DiscordException as exc:
-                        Logger.error(
-                            "SyncCommandsEngine -",
-                            f"Failed to register command group '{root_group.name}' for {guild.name} ({guild_id}): {exc}",
-                        )
-                        disabled_groups.append(root_group.name)
-                        stage_message = (
-                            f"Failed to register '{root_group.name}' for {guild.name} ({guild_id})."
-                        )
-                    else:
-                        added_successfully = True
-                        stage_message = (
-                            f"Registered '{root_group.name}' for {guild.name} ({guild_id})."
-                        )
+                    self.registration.register_guild_root(guild_id, clone)
                 except discord.DiscordException as exc:
                     Logger.error(
                         "SyncCommandsEngine -",
@@ -142,19 +272,30 @@ class GuildSynchroniser:
                         f"Failed to register '{root_group.name}' for {guild.name} ({guild_id})."
                     )
                 else:
-                    added_successfully = True
+                    enabled_groups.append(root_group.name)
                     stage_message = (
                         f"Registered '{root_group.name}' for {guild.name} ({guild_id})."
                     )
 
-                if added_successfully:
-                    enabled_groups.append(root_group.name)
-
             current_step += 1
             percent = (current_step / total_steps) * 100
             await notify(percent, stage_message)
 
-        tree.copy_global_to(guild=guild_obj)
+        payload, local_commands = self.registration.guild_payload(guild_id, scope_class, self.global_roots)
+        digest = payload_digest(payload)
+        global_labels = {self.cloner.format_label(group) for group in self.global_roots.values()}
+        labels = sorted({self.cloner.format_label(command) for command in local_commands} | global_labels)
+        if await self._payload_current(guild_id, payload, digest):
+            set_sync_hash(guild_id, digest)
+            self.state.record_payload_check(skipped=True)
+            disabled_unique = sorted(set(disabled_groups))
+            self.state.update_guild(guild_id, labels, disabled_unique)
+            await notify(100.0, f"Commands for {guild.name} ({guild_id}) are already up to date.")
+            Logger.info(
+                "SyncCommandsEngine -",
+                f"Command payload unchanged for {guild.name} ({guild_id}); skipped sync.",
+            )
+            return local_commands
 
         submission_percent = (current_step / total_steps) * 100
         await notify(min(99.0, submission_percent), f"Submitting sync to Discord for {guild.name} ({guild_id})...")
@@ -183,7 +324,7 @@ class GuildSynchroniser:
             )
 
         try:
-            synced_commands = await tree.sync(guild=guild_obj)
+            synced_count = await self.registration.push(guild_id, payload)
         except discord.HTTPException as exc:
             Logger.error(
                 "SyncCommandsEngine -",
@@ -204,9 +345,10 @@ class GuildSynchroniser:
                 with suppress(asyncio.CancelledError):
                     await countdown_task
 
+        self.state.record_payload_check(skipped=False)
+        set_sync_hash(guild_id, digest)
         await notify(100.0, f"Discord confirmed sync for {guild.name} ({guild_id}).")
 
-        labels = sorted({self.cloner.format_label(command) for command in synced_commands})
         disabled_unique = sorted(set(disabled_groups))
         self.state.update_guild(guild_id, labels, disabled_unique)
 
@@ -214,7 +356,7 @@ class GuildSynchroniser:
             joined_groups = ", ".join(sorted(enabled_groups))
             commands_desc = ", ".join(labels) if labels else "(no commands registered)"
             message = (
-                f"Synced {len(synced_commands)} commands to {guild.name} ({guild_id})"
+                f"Synced {synced_count} commands to {guild.name} ({guild_id})"
                 f" | groups: {joined_groups} | commands: {commands_desc}"
             )
 
@@ -224,12 +366,17 @@ class GuildSynchroniser:
             Logger.success("SyncCommandsEngine -", message)
         else:
             message = f"No commands configured for {guild.name} ({guild_id}); ensured removal."
+            if self.global_roots:
+                message = (
+                    f"No guild-specific commands for {guild.name} ({guild_id});"
+                    f" global groups: {', '.join(sorted(self.global_roots))}."
+                )
             if disabled_unique:
                 message += f" Disabled groups: {', '.join(disabled_unique)}."
 
             Logger.info("SyncCommandsEngine -", message)
 
-        return synced_commands
+        return local_commands
 
     async def _wait_with_logs(
         self,
@@ -0,0 +1,3 @@
+from .main import DriftDetector, DriftStats
+
+__all__ = ["DriftDetector", "DriftStats"]
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+from cogs.guildSync.core.config.lib import clear_sync_hash, flush_sync_hashes, get_setting
+from cogs.guildSync.core.engine.syncCommands.modules.reconcile import DRIFTED, IN_SYNC, MISSING, PayloadAudit
+from interface.logger import Logger
+
+if TYPE_CHECKING:
+    from cogs.guildSync.core.engine.syncCommands.main import SyncCommandsEngine
+    from cogs.guildSync.core.engine.syncGuilds.main import GuildSyncEngine
+
+
+@dataclass
+class DriftStats:
+    scans: int = 0
+    in_sync: int = 0
+    drifted: int = 0
+    missing: int = 0
+    errors: int = 0
+    resyncs_queued: int = 0
+    passes: int = 0
+    # Progress through the current pass over the managed guilds.
+    pass_scanned: int = 0
+    pass_size: int = 0
+    last_pass_seconds: Optional[float] = None
+    last_scan_at: Optional[float] = None
+    # Guild ids found out of sync in the current or last pass, with their status.
+    recent_drift: Dict[int, str] = field(default_factory=dict)
+
+    @property
+    def coverage(self) -> float:
+        return self.pass_scanned / self.pass_size if self.pass_size else 0.0
+
+
+class DriftDetector:
+    """Walk managed guilds in the background and resync those whose remote commands drifted.
+
+    Each scan is one GET. Scans are spaced to stay within
+    ``drift_scan_requests_per_minute``, with jitter so they do not line up
+    with other periodic work.
+    """
+
+    def __init__(self, guild_engine: "GuildSyncEngine", commands_engine: "SyncCommandsEngine") -> None:
+        self.guild_engine = guild_engine
+        self.commands_engine = commands_engine
+        self.stats = DriftStats()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        rate = float(get_setting("drift_scan_requests_per_minute"))
+        if rate <= 0 or (self._task is not None and not self._task.done()):
+            return
+
+        self._task = asyncio.create_task(self._run(60.0 / rate))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def _delay(self, interval: float) -> float:
+        jitter = min(1.0, max(0.0, float(get_setting("drift_scan_jitter"))))
+        return interval * random.uniform(1.0 - jitter, 1.0 + jitter)
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            # Snapshot the ids so guilds added mid-pass wait for the next one.
+            guild_ids: List[int] = list(self.guild_engine.state.guilds)
+            random.shuffle(guild_ids)
+            started = time.monotonic()
+            self.stats.pass_size = len(guild_ids)
+            self.stats.pass_scanned = 0
+            self.stats.recent_drift = {}
+
+            for guild_id in guild_ids:
+                await asyncio.sleep(self._delay(interval))
+                try:
+                    await self._scan(guild_id)
+                except Exception as exc:  # noqa: BLE001
+                    self.stats.errors += 1
+                    Logger.error("DriftDetector -", f"Drift scan failed for guild {guild_id}: {exc}")
+                self.stats.pass_scanned += 1
+
+            if not guild_ids:
+                await asyncio.sleep(self._delay(interval))
+                continue
+
+            self.stats.passes += 1
+            self.stats.last_pass_seconds = time.monotonic() - started
+            drifted = len(self.stats.recent_drift)
+            if drifted:
+                Logger.info(
+                    "DriftDetector -",
+                    f"Scanned {len(guild_ids)} guilds in {self.stats.last_pass_seconds:.0f}s; {drifted} had drifted.",
+                )
+
+    def _busy(self, guild_id: int) -> bool:
+        engine = self.commands_engine
+        return guild_id in engine.scheduler.pending_guild_ids() or engine.guild_flights.in_flight(guild_id)
+
+    async def _scan(self, guild_id: int) -> None:
+        # A queued or running sync will rewrite the guild anyway; its remote state is in flux.
+        if self._busy(guild_id):
+            return
+
+        guild = self.guild_engine.resolve_guild(guild_id)
+        if guild is None:
+            return
+
+        result = await self.commands_engine.synchroniser.audit_guild(guild_id)
+        self._record(result)
+        if result.status not in (DRIFTED, MISSING) or self._busy(guild_id):
+            return
+
+        Logger.warning(
+            "DriftDetector -",
+            f"Commands for {guild.name} ({guild_id}) are {result.status}; queueing resync.",
+        )
+        # The stored hash still matches the local payload, so it must go for the resync to push.
+        clear_sync_hash(guild_id)
+        flush_sync_hashes()
+        self.commands_engine.schedule_sync({guild_id: guild})
+        self.stats.resyncs_queued += 1
+
+    def _record(self, result: PayloadAudit) -> None:
+        stats = self.stats
+        stats.scans += 1
+        stats.last_scan_at = time.time()
+        if result.status == IN_SYNC:
+            stats.in_sync += 1
+        elif result.status == DRIFTED:
+            stats.drifted += 1
+        elif result.status == MISSING:
+            stats.missing += 1
+        else:
+            stats.errors += 1
+
+        if result.status in (DRIFTED, MISSING) and result.guild_id is not None:
+            stats.recent_drift[result.guild_id] = result.status
@@ -1,18 +1,31 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Set, TYPE_CHECKING
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple, TYPE_CHECKING
 
 import discord
 from discord.ext import commands
 
-from cogs.guildSync.core.config.lib import is_guild_suppressed, loaded_guilds
+from cogs.guildSync.core.config.lib import (
+    clear_sync_hash,
+    clear_unreachable_guild,
+    drop_invite,
+    flush_invites,
+    flush_sync_hashes,
+    flush_unreachable_guilds,
+    has_pending_invites,
+    is_guild_configured,
+    is_guild_suppressed,
+    loaded_guilds,
+    queue_invite,
+)
 from interface.logger import Logger
 
+from .modules.channels import NotificationChannelCache
 from .modules.collector import ConfiguredGuildsCollector
 from .modules.commands import GuildCommandSynchroniser
+from .modules.invites import InviteDispatcher
 from .modules.registrar import ConfiguredGuildRegistrar
-from .modules.state import ConfiguredGuildsState
-from cogs.guildSync.core.ui.inviteView import GuildSyncInviteView
+from .modules.state import ConfiguredGuildsState, GuildLike, GuildRecord
 
 if TYPE_CHECKING:
     from cogs.guildSync.core.engine.syncCommands.main import SyncCommandsEngine
@@ -27,18 +40,24 @@ class GuildSyncEngine:
         self.synced_guilds = self.state.guilds
         self.registrar = ConfiguredGuildRegistrar(bot, self.collector)
         self.commands_engine: Optional["SyncCommandsEngine"] = None
-        self._active_invites: Set[int] = set()
+        self.invites = InviteDispatcher(self)
+        self.notification_channels = NotificationChannelCache(bot)
         self._removed_ids: Set[int] = set()
+        # Gateway events are ignored until the first full sync has built the state.
+        self._initialised = False
 
     def attach_commands_engine(self, engine: "SyncCommandsEngine") -> None:
         self.commands_engine = engine
+        engine.attach_guild_source(self.resolve_guilds)
+        engine.attach_sync_observer(self.state.record_sync)
 
     async def sync_guilds(self) -> Dict[int, discord.Guild]:
         if not loaded_guilds:
             Logger.warning("GuildSyncEngine -", "No guilds configured; nothing to sync.")
             self.state.clear()
+            self._initialised = True
             await self._prompt_unmanaged_guilds(list(self.bot.guilds))
-            return self.state.snapshot()
+            return {}
 
         Logger.info("GuildSyncEngine -", "Starting guild synchronization process.")
 
@@ -47,12 +66,13 @@ class GuildSyncEngine:
         self.state.replace(result.resolved)
         current_ids = set(result.resolved.keys())
         self._removed_ids = previous_ids - current_ids
+        self._initialised = True
 
         self.collector.report_missing(result.missing)
-        unmanaged = self.collector.report_unmanaged(loaded_guilds.values())
+        unmanaged = self.collector.report_unmanaged()
         await self._prompt_unmanaged_guilds(unmanaged)
 
-        return self.state.snapshot()
+        return dict(result.resolved)
 
     async def add_guild(
         self,
@@ -61,8 +81,10 @@ class GuildSyncEngine:
         alias: Optional[str] = None,
         persist: bool = True,
         overwrite: bool = False,
+        sync: bool = True,
     ) -> bool:
-        guild = self.state.get(guild_id)
+        """Register ``guild_id``; with ``sync=False`` the caller schedules its command sync."""
+        guild = self.resolve_guild(guild_id)
 
         if persist:
             if guild is None:
@@ -88,25 +110,97 @@ class GuildSyncEngine:
 
         self.state.update(guild_id, guild)
         self.mark_invite_complete(guild_id)
-        await self._sync_commands_for_guild(guild_id, guild)
+        if sync:
+            await self._sync_commands_for_guild(guild_id, guild)
         return True
 
-    def get_synced_guilds(self) -> Dict[int, discord.Guild]:
-        return self.state.snapshot()
+    async def drop_guilds(self, guild_ids: Set[int]) -> None:
+        """Forget guilds removed from the config and clear their guild commands."""
+        dropped: List[GuildLike] = []
+        for guild_id in guild_ids:
+            guild = self.resolve_guild(guild_id) or self.bot.get_guild(guild_id)
+            self.state.remove(guild_id)
+            if guild is not None:
+                dropped.append(guild)
 
-    async def ensure_guilds(self) -> Dict[int, discord.Guild]:
-        return self.state.snapshot()
+        if self.commands_engine is None:
+            return
+
+        for guild_id in guild_ids:
+            self.commands_engine.state.remove_guild(guild_id)
+        await self.commands_engine.desync_commands(dropped)
+
+    async def handle_guild_available(self, guild: discord.Guild) -> None:
+        """Apply a join or an outage recovery for one guild without rescanning the fleet."""
+        if not self._initialised:
+            return
+
+        if not is_guild_configured(guild.id):
+            await self._prompt_unmanaged_guilds([guild])
+            return
+
+        known = self.state.get(guild.id) is not None
+        self.state.update(guild.id, guild)
+        clear_unreachable_guild(guild.id)
+        flush_unreachable_guilds()
+        if known or self.commands_engine is None:
+            return
+
+        Logger.info("GuildSyncEngine -", f"Managed guild {guild.name} ({guild.id}) became available; queueing sync.")
+        self.commands_engine.schedule_sync({guild.id: guild})
+
+    def handle_guild_remove(self, guild: discord.Guild) -> None:
+        """Forget a guild the bot left; the config entry is kept so a rejoin syncs again."""
+        self.mark_invite_complete(guild.id)
+        self.invalidate_notification_channel(guild.id)
+        if self.state.get(guild.id) is None:
+            return
+
+        self.state.remove(guild.id)
+        if self.commands_engine is not None:
+            self.commands_engine.state.remove_guild(guild.id)
+        # Force a full push if the bot is invited back.
+        clear_sync_hash(guild.id)
+        flush_sync_hashes()
+        Logger.info("GuildSyncEngine -", f"Left managed guild {guild.name} ({guild.id}).")
+
+    def get_unmanaged_page(self, page: int, per_page: int) -> Tuple[List[discord.Guild], int]:
+        """Return one name-sorted page of unmanaged guilds and the total count."""
+        unmanaged = sorted(self.collector.find_unmanaged(), key=lambda guild: (guild.name.lower(), guild.id))
+        start = max(0, page - 1) * per_page
+        return unmanaged[start:start + per_page], len(unmanaged)
+
+    def get_synced_guilds(self) -> Mapping[int, GuildRecord]:
+        """Read-only live view of managed guilds; check ``state.generation`` to detect changes."""
+        return self.state.guilds
+
+    def resolve_guild(self, guild_id: int) -> Optional[GuildLike]:
+        """The cached ``discord.Guild`` for a managed guild, or its record when the cache lacks it."""
+        record = self.state.get(guild_id)
+        if record is None:
+            return None
+        return self.bot.get_guild(guild_id) or record
+
+    def resolve_guilds(self, guild_ids: Optional[Iterable[int]] = None) -> Dict[int, GuildLike]:
+        ids = self.state.guilds.keys() if guild_ids is None else guild_ids
+        resolved: Dict[int, GuildLike] = {}
+        for guild_id in ids:
+            guild = self.resolve_guild(guild_id)
+            if guild is not None:
+                resolved[guild_id] = guild
+        return resolved
+
+    async def ensure_guilds(self) -> Dict[int, GuildLike]:
+        return self.resolve_guilds()
 
-    async def _sync_commands_for_guild(self, guild_id: int, guild: discord.Guild) -> None:
+    async def _sync_commands_for_guild(self, guild_id: int, guild: GuildLike) -> None:
         await self.command_synchroniser.sync_commands(guild_id, guild, self.commands_engine)
 
     def get_removed_guild_ids(self) -> Set[int]:
         return set(self._removed_ids)
 
     async def _prompt_unmanaged_guilds(self, unmanaged_guilds: List[discord.Guild]) -> None:
-        if not unmanaged_guilds:
-            return
-
+        queued = 0
         for guild in unmanaged_guilds:
             if guild.id in self.state.guilds:
                 continue
@@ -114,59 +208,22 @@ class GuildSyncEngine:
             if is_guild_suppressed(guild.id):
                 continue
 
-            if guild.id in self._active_invites:
-                continue
-
-            channel = self._select_notification_channel(guild)
-            if channel is None:
-                Logger.warning(
-                    "GuildSyncEngine -",
-                    f"No suitable channel found to prompt sync in guild {guild.name} ({guild.id}).",
-                )
-                continue
+            # Already queued or sent, possibly before a restart.
+            if queue_invite(guild.id):
+                queued += 1
 
-            view = GuildSyncInviteView(self, guild)
-            self._active_invites.add(guild.id)
-
-            try:
-                await channel.send(view=view)
-                Logger.info(
-                    "GuildSyncEngine -",
-                    f"Prompted guild {guild.name} ({guild.id}) for sync authorization.",
-                )
-            except discord.Forbidden:
-                Logger.warning(
-                    "GuildSyncEngine -",
-                    f"Missing permissions to send sync prompt in guild {guild.name} ({guild.id}).",
-                )
-                self._active_invites.discard(guild.id)
-            except discord.HTTPException as exc:
-                Logger.error(
-                    "GuildSyncEngine -",
-                    f"Failed to send sync prompt in guild {guild.name} ({guild.id}): {exc}",
-                )
-                self._active_invites.discard(guild.id)
+        if queued:
+            flush_invites()
+            Logger.info("GuildSyncEngine -", f"Queued {queued} sync invitations.")
+        if has_pending_invites():
+            self.invites.wake()
 
     def mark_invite_complete(self, guild_id: int) -> None:
-        self._active_invites.discard(guild_id)
+        drop_invite(guild_id)
+        flush_invites()
 
     def _select_notification_channel(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
-        bot_user = self.bot.user
-        if bot_user is None:
-            return None
-
-        member = guild.me or guild.get_member(bot_user.id)
-        if member is None:
-            return None
-
-        system_channel = getattr(guild, "system_channel", None)
-        if system_channel and system_channel.permissions_for(member).send_messages:
-            return system_channel
-
-        for channel in sorted(guild.text_channels, key=lambda c: c.position):
-            perms = channel.permissions_for(member)
-            if perms.send_messages and perms.view_channel:
-                return channel
+        return self.notification_channels.get(guild)
 
-        return None
-    
+    def invalidate_notification_channel(self, guild_id: int) -> None:
+        self.notification_channels.invalidate(guild_id)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import discord
+from discord.ext import commands
+
+
+class NotificationChannelCache:
+    """Remember which channel each guild's prompts go to.
+
+    Channel ids (or ``None`` when nothing is writable) are cached per guild and
+    dropped by the channel, guild and role events that can change the answer.
+    """
+
+    def __init__(self, bot: commands.Bot) -> None:
+        self.bot = bot
+        self._channels: Dict[int, Optional[int]] = {}
+
+    def get(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        if guild.id in self._channels:
+            channel_id = self._channels[guild.id]
+            if channel_id is None:
+                return None
+            channel = guild.get_channel(channel_id)
+            if isinstance(channel, discord.TextChannel):
+                return channel
+
+        channel = self._select(guild)
+        self._channels[guild.id] = channel.id if channel is not None else None
+        return channel
+
+    def invalidate(self, guild_id: int) -> None:
+        self._channels.pop(guild_id, None)
+
+    def clear(self) -> None:
+        self._channels.clear()
+
+    def _select(self, guild: discord.Guild) -> Optional[discord.TextChannel]:
+        bot_user = self.bot.user
+        if bot_user is None:
+            return None
+
+        member = guild.me or guild.get_member(bot_user.id)
+        if member is None:
+            return None
+
+        system_channel = getattr(guild, "system_channel", None)
+        if system_channel and system_channel.permissions_for(member).send_messages:
+            return system_channel
+
+        for channel in sorted(guild.text_channels, key=lambda c: c.position):
+            perms = channel.permissions_for(member)
+            if perms.send_messages and perms.view_channel:
+                return channel
+
+        return None
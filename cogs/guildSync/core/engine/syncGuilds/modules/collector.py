@@ -1,11 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import discord
 from discord.ext import commands
 
+from cogs.guildSync.core.config.lib import (
+    clear_unreachable_guild,
+    flush_unreachable_guilds,
+    get_setting,
+    get_unreachable_guild,
+    is_guild_configured,
+    mark_guild_unreachable,
+)
 from interface.logger import Logger
 
 
@@ -20,12 +29,47 @@ class ConfiguredGuildsCollector:
         self.bot = bot
 
     async def collect(self, configured: Dict[str, int]) -> CollectionResult:
-        """Resolve configured guild ids into guild objects with logging."""
+        """Resolve configured guild ids into guild objects with logging.
+
+        Cached guilds resolve immediately; the rest are fetched concurrently
+        (``resolve_workers``), skipping ids that recently returned Forbidden or
+        NotFound until their TTL expires.
+        """
+        outcomes: Dict[int, Optional[discord.Guild]] = {}
+        to_fetch: List[Tuple[str, int]] = []
+        skipped = 0
+
+        for guild_name, guild_id in configured.items():
+            guild = self.bot.get_guild(guild_id)
+            if guild is not None:
+                outcomes[guild_id] = guild
+                clear_unreachable_guild(guild_id)
+            elif get_unreachable_guild(guild_id) is not None:
+                outcomes[guild_id] = None
+                skipped += 1
+            else:
+                to_fetch.append((guild_name, guild_id))
+
+        if to_fetch:
+            semaphore = asyncio.Semaphore(max(1, int(get_setting("resolve_workers"))))
+
+            async def fetch(guild_name: str, guild_id: int) -> None:
+                async with semaphore:
+                    outcomes[guild_id] = await self._resolve_guild(guild_name, guild_id)
+
+            await asyncio.gather(*(fetch(guild_name, guild_id) for guild_name, guild_id in to_fetch))
+
+        flush_unreachable_guilds()
+        if skipped:
+            Logger.info(
+                "GuildSyncEngine -",
+                f"Skipped {skipped} guilds that recently failed to resolve; they are retried once their cache entry expires.",
+            )
+
         resolved: Dict[int, discord.Guild] = {}
         missing: List[Tuple[str, int]] = []
-
         for guild_name, guild_id in configured.items():
-            guild = await self._resolve_guild(guild_name, guild_id)
+            guild = outcomes.get(guild_id)
             if guild is None:
                 missing.append((guild_name, guild_id))
                 continue
@@ -41,32 +85,39 @@ class ConfiguredGuildsCollector:
     async def _resolve_guild(self, guild_name: str, guild_id: int) -> Optional[discord.Guild]:
         guild = self.bot.get_guild(guild_id)
         if guild is not None:
+            clear_unreachable_guild(guild_id)
             return guild
 
         try:
-            return await self.bot.fetch_guild(guild_id)
+            guild = await self.bot.fetch_guild(guild_id)
         except discord.Forbidden:
             Logger.warning(
                 "GuildSyncEngine -",
                 f"Missing permissions to access guild {guild_name} ({guild_id}); cannot sync commands.",
             )
+            mark_guild_unreachable(guild_id, "forbidden")
         except discord.NotFound:
             Logger.warning(
                 "GuildSyncEngine -",
                 f"Bot is not a member of guild {guild_name} ({guild_id}); cannot sync commands.",
             )
+            mark_guild_unreachable(guild_id, "not_found")
         except discord.HTTPException as exc:
             Logger.error(
                 "GuildSyncEngine -",
                 f"HTTP error while fetching guild {guild_name} ({guild_id}): {exc}.",
             )
+        else:
+            clear_unreachable_guild(guild_id)
+            return guild
 
         return None
 
     async def resolve_single(self, guild_id: int, label: Optional[str] = None) -> Optional[discord.Guild]:
-        """Resolve a single guild id for ad-hoc additions."""
+        """Resolve a single guild id for ad-hoc additions, ignoring the unreachable cache."""
         name_hint = label or "<unknown>"
         guild = await self._resolve_guild(name_hint, guild_id)
+        flush_unreachable_guilds()
         if guild is None:
             Logger.error(
                 "GuildSyncEngine -",
@@ -88,14 +139,16 @@ class ConfiguredGuildsCollector:
                 f"Guild {guild_name} ({guild_id}) could not be synchronized.",
             )
 
-    def report_unmanaged(self, configured_ids: Iterable[int]) -> List[discord.Guild]:
-        unmanaged = [guild for guild in self.bot.guilds if guild.id not in configured_ids]
+    def find_unmanaged(self) -> List[discord.Guild]:
+        return [guild for guild in self.bot.guilds if not is_guild_configured(guild.id)]
+
+    def report_unmanaged(self) -> List[discord.Guild]:
+        unmanaged = self.find_unmanaged()
         if not unmanaged:
             return []
 
-        details = ", ".join(f"{guild.name} ({guild.id})" for guild in unmanaged)
         Logger.info(
             "GuildSyncEngine -",
-            f"Bot is in guilds not present in config: {details}.",
+            f"Bot is in {len(unmanaged)} guilds not present in config; see /sync unmanaged for details.",
         )
         return unmanaged
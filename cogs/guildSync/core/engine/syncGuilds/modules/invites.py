@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Optional
+
+import discord
+
+from cogs.guildSync.core.config.lib import (
+    drop_invite,
+    flush_invites,
+    get_setting,
+    has_pending_invites,
+    is_guild_configured,
+    is_guild_suppressed,
+    mark_invite_sent,
+    next_pending_invite,
+)
+from cogs.guildSync.core.ui.inviteView import GuildSyncInviteView
+from interface.logger import Logger
+
+if TYPE_CHECKING:
+    from cogs.guildSync.core.engine.syncGuilds.main import GuildSyncEngine
+
+
+class TokenBucket:
+    """Allow ``capacity`` sends at once, refilled at ``rate`` tokens per second."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = max(rate, 1e-6)
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated: Optional[float] = None
+
+    async def acquire(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            if self._updated is not None:
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class InviteDispatcher:
+    """Send queued sync invitations from the persisted outbox at a bounded rate.
+
+    Sent invites stay recorded in ``invites.json``, so a restart only sends
+    what is still outstanding.
+    """
+
+    def __init__(self, engine: "GuildSyncEngine") -> None:
+        self.engine = engine
+        self.bucket = TokenBucket(
+            float(get_setting("invite_rate_per_minute")) / 60.0,
+            int(get_setting("invite_burst")),
+        )
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def wake(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wake.set()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        flush_invites()
+
+    async def _run(self) -> None:
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            try:
+                while has_pending_invites():
+                    await self.bucket.acquire()
+                    # Taken after the wait, so invites dropped meanwhile are not sent.
+                    guild_id = next_pending_invite()
+                    if guild_id is None:
+                        break
+                    await self._dispatch(guild_id)
+            finally:
+                # Once per drained batch; the write itself runs off the event loop.
+                flush_invites()
+
+    async def _dispatch(self, guild_id: int) -> None:
+        guild = self.engine.bot.get_guild(guild_id)
+        # The guild may have been configured, suppressed or left while queued.
+        if guild is None or is_guild_configured(guild_id) or is_guild_suppressed(guild_id):
+            drop_invite(guild_id)
+            return
+
+        channel = self.engine._select_notification_channel(guild)
+        if channel is None:
+            Logger.warning(
+                "GuildSyncEngine -",
+                f"No suitable channel found to prompt sync in guild {guild.name} ({guild.id}).",
+            )
+            drop_invite(guild_id)
+            return
+
+        view = GuildSyncInviteView(guild.id)
+        try:
+            message = await channel.send(view=view)
+        except discord.Forbidden:
+            Logger.warning(
+                "GuildSyncEngine -",
+                f"Missing permissions to send sync prompt in guild {guild.name} ({guild.id}).",
+            )
+            drop_invite(guild_id)
+            return
+        except discord.HTTPException as exc:
+            Logger.error(
+                "GuildSyncEngine -",
+                f"Failed to send sync prompt in guild {guild.name} ({guild.id}): {exc}",
+            )
+            drop_invite(guild_id)
+            return
+
+        mark_invite_sent(guild_id, channel.id, message.id)
+        Logger.info(
+            "GuildSyncEngine -",
+            f"Prompted guild {guild.name} ({guild.id}) for sync authorization.",
+        )
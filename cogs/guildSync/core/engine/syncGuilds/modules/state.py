@@ -1,30 +1,79 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, Optional
+import time
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Protocol, Union
 
 import discord
 
 
-@dataclass
+class _NamedGuild(Protocol):
+    id: int
+    name: str
+
+
+class GuildRecord:
+    """What the engine keeps per managed guild; the live ``discord.Guild`` is looked up on demand.
+
+    ``id`` and ``name`` let a record stand in for a guild wherever only those
+    are needed (logging, ``discord.Object``-style snowflake use).
+    """
+
+    __slots__ = ("id", "name", "last_synced_at", "last_sync_ok")
+
+    def __init__(self, guild_id: int, name: str) -> None:
+        self.id = guild_id
+        self.name = name
+        self.last_synced_at: Optional[float] = None
+        self.last_sync_ok: Optional[bool] = None
+
+
+GuildLike = Union[discord.Guild, GuildRecord]
+
+
 class ConfiguredGuildsState:
-    guilds: Dict[int, discord.Guild] = field(default_factory=dict)
+    def __init__(self) -> None:
+        self._records: Dict[int, GuildRecord] = {}
+        # Read-only live view handed to readers instead of a copy.
+        self.guilds: Mapping[int, GuildRecord] = MappingProxyType(self._records)
+        # Bumped on every change so derived indexes know when to rebuild.
+        self.generation = 0
+
+    def _record_for(self, guild_id: int, guild: _NamedGuild) -> GuildRecord:
+        record = self._records.get(guild_id)
+        if record is None:
+            return GuildRecord(guild_id, guild.name)
+        record.name = guild.name
+        return record
 
-    def replace(self, entries: Dict[int, discord.Guild]) -> None:
-        self.guilds.clear()
-        self.guilds.update(entries)
+    def replace(self, entries: Mapping[int, _NamedGuild]) -> None:
+        # Keep last-sync metadata for guilds that stay managed.
+        records = {guild_id: self._record_for(guild_id, guild) for guild_id, guild in entries.items()}
+        self._records.clear()
+        self._records.update(records)
+        self.generation += 1
 
-    def update(self, guild_id: int, guild: discord.Guild) -> None:
-        self.guilds[guild_id] = guild
+    def update(self, guild_id: int, guild: _NamedGuild) -> None:
+        record = self._records.get(guild_id)
+        if record is not None and record.name == guild.name:
+            return
+        self._records[guild_id] = self._record_for(guild_id, guild)
+        self.generation += 1
 
-    def get(self, guild_id: int) -> Optional[discord.Guild]:
-        return self.guilds.get(guild_id)
+    def get(self, guild_id: int) -> Optional[GuildRecord]:
+        return self._records.get(guild_id)
 
     def remove(self, guild_id: int) -> None:
-        self.guilds.pop(guild_id, None)
+        if self._records.pop(guild_id, None) is not None:
+            self.generation += 1
 
     def clear(self) -> None:
-        self.guilds.clear()
+        self._records.clear()
+        self.generation += 1
 
-    def snapshot(self) -> Dict[int, discord.Guild]:
-        return dict(self.guilds)
+    def record_sync(self, guild_id: int, ok: bool) -> None:
+        record = self._records.get(guild_id)
+        if record is None:
+            return
+        record.last_synced_at = time.time()
+        record.last_sync_ok = ok
@@ -0,0 +1,3 @@
+from .main import ConfigWatcher
+
+__all__ = ["ConfigWatcher"]
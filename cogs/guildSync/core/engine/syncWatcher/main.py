@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Dict, Optional, TYPE_CHECKING
+
+from discord.ext import commands
+
+from cogs.guildSync.core.config.lib import (
+    COMMANDS_FILE,
+    GUILDS_FILE,
+    FileStamp,
+    ScopeChange,
+    file_stamp,
+    get_setting,
+    is_own_write,
+    replace_command_scopes,
+    replace_guilds,
+    scope_allows,
+)
+from interface.logger import Logger
+
+if TYPE_CHECKING:
+    from cogs.guildSync.core.engine.syncCommands.main import SyncCommandsEngine
+    from cogs.guildSync.core.engine.syncGuilds.main import GuildSyncEngine
+
+
+def _read_json(path: str) -> Any:
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+class ConfigWatcher:
+    """Poll ``guilds.json`` and ``commands.json`` and apply manual edits without a restart.
+
+    Only the changed file is re-parsed, and only guilds whose effective command
+    set changed are resynced. Writes made by the bot itself are ignored.
+    """
+
+    def __init__(
+        self,
+        bot: commands.Bot,
+        guild_engine: "GuildSyncEngine",
+        commands_engine: "SyncCommandsEngine",
+    ) -> None:
+        self.bot = bot
+        self.guild_engine = guild_engine
+        self.commands_engine = commands_engine
+        self._stamps: Dict[str, Optional[FileStamp]] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    def start(self) -> None:
+        interval = float(get_setting("config_watch_interval_seconds"))
+        if interval <= 0 or (self._task is not None and not self._task.done()):
+            return
+
+        for path in (GUILDS_FILE, COMMANDS_FILE):
+            self._stamps[path] = file_stamp(path)
+        self._task = asyncio.create_task(self._run(interval))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            for path in (GUILDS_FILE, COMMANDS_FILE):
+                try:
+                    await self._check(path)
+                except Exception as exc:  # noqa: BLE001
+                    Logger.error("ConfigWatcher -", f"Failed to reload {path}: {exc}")
+
+    async def _check(self, path: str) -> None:
+        stamp = file_stamp(path)
+        if stamp is None or stamp == self._stamps.get(path):
+            return
+
+        self._stamps[path] = stamp
+        if is_own_write(path, stamp):
+            return
+
+        try:
+            raw = await asyncio.to_thread(_read_json, path)
+        except (OSError, ValueError) as exc:
+            # Likely a half-saved edit; the next save produces a new stamp.
+            Logger.warning("ConfigWatcher -", f"Ignoring unreadable {path}: {exc}")
+            return
+
+        if path == GUILDS_FILE:
+            await self._apply_guilds(raw)
+        else:
+            self._apply_command_scopes(raw)
+
+    async def _apply_guilds(self, raw: Any) -> None:
+        added, removed = replace_guilds(raw)
+        if not (added or removed):
+            return
+
+        Logger.info(
+            "ConfigWatcher -",
+            f"guilds.json changed: {len(added)} guilds added, {len(removed)} removed.",
+        )
+        if removed:
+            await self.guild_engine.drop_guilds(removed)
+        registered = [
+            guild_id
+            for guild_id, name in added.items()
+            if await self.guild_engine.add_guild(guild_id, alias=name, persist=False, sync=False)
+        ]
+        # One debounced batch, like scope edits, rather than a direct sync per guild.
+        guilds = self.guild_engine.resolve_guilds(registered)
+        if guilds:
+            self.commands_engine.schedule_sync(guilds)
+
+    def _apply_command_scopes(self, raw: Any) -> None:
+        changes = replace_command_scopes(raw)
+        if not changes:
+            return
+
+        guilds = self.guild_engine.get_synced_guilds()
+        affected_ids = [guild_id for guild_id in guilds if self._is_affected(changes, guild_id)]
+        if not affected_ids and self.commands_engine.hybrid_enabled():
+            # Scoping a root can move it out of the global set without changing any
+            # guild's effective commands; the sync re-partitions and hash-skips the rest.
+            affected_ids = list(guilds)
+        affected = self.guild_engine.resolve_guilds(affected_ids)
+        Logger.info(
+            "ConfigWatcher -",
+            f"commands.json changed: {len(changes)} scope entries, {len(affected)} of {len(guilds)} guilds affected.",
+        )
+        if affected:
+            self.commands_engine.schedule_sync(affected)
+
+    @staticmethod
+    def _is_affected(changes: Dict[str, ScopeChange], guild_id: int) -> bool:
+        return any(
+            scope_allows(before, guild_id) != scope_allows(after, guild_id)
+            for before, after in changes.values()
+        )
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, List
+import re
+from typing import TYPE_CHECKING, Optional
 
 import discord
 from discord import ui
@@ -11,87 +12,86 @@ if TYPE_CHECKING:
     from cogs.guildSync.core.engine.syncGuilds.main import GuildSyncEngine
 
 
-class GuildSyncInviteView(ui.LayoutView):
-    def __init__(self, engine: GuildSyncEngine, guild: discord.Guild) -> None:
-        super().__init__(timeout=None)
-        self.engine = engine
-        self.guild = guild
+_CUSTOM_ID = "guildsync:invite:{action}:{guild_id}"
 
-        self._header_display = ui.TextDisplay("### Ready to Sync Commands")
-        self._body_display = ui.TextDisplay(
-            "This bot is currently not synchronizing commands for this guild. "
-            "If you have the Manage Server permission you can opt in or dismiss this notice."
-        )
 
-        container = ui.Container(accent_color=discord.Color.blurple())
-        container.add_item(self._header_display)
-        container.add_item(self._body_display)
+def _resolve_engine(interaction: discord.Interaction) -> Optional[GuildSyncEngine]:
+    cog = interaction.client.get_cog("GuildSyncCog")
+    return getattr(cog, "sync_guilds_engine", None)
 
-        self._buttons: List[ui.Button] = []
-        button_row = ui.ActionRow()
-        button_row.add_item(self._build_sync_button())
-        button_row.add_item(self._build_decline_button())
-        container.add_item(button_row)
-
-        self.add_item(container)
 
-    def _has_permission(self, interaction: discord.Interaction) -> bool:
-        if interaction.guild is None:
-            return False
-        member = interaction.user
-        return isinstance(member, discord.Member) and member.guild_permissions.manage_guild
+class InviteDecisionButton(
+    ui.DynamicItem[ui.Button],
+    template=r"guildsync:invite:(?P<action>approve|decline):(?P<guild_id>[0-9]+)",
+):
+    """Invite button whose custom_id carries the guild id, so it keeps working across restarts."""
 
-    def _disable_buttons(self) -> None:
-        for button in self._buttons:
-            button.disabled = True
+    def __init__(self, action: str, guild_id: int, *, disabled: bool = False) -> None:
+        approve = action == "approve"
+        super().__init__(
+            ui.Button(
+                label="Sync Now" if approve else "Not Now",
+                style=discord.ButtonStyle.success if approve else discord.ButtonStyle.danger,
+                custom_id=_CUSTOM_ID.format(action=action, guild_id=guild_id),
+                disabled=disabled,
+            )
+        )
+        self.action = action
+        self.guild_id = guild_id
 
-    async def _finalize(
-        self,
+    @classmethod
+    async def from_custom_id(
+        cls,
         interaction: discord.Interaction,
-        *,
-        header: str,
-        body: str,
-        followup: str,
-    ) -> None:
-        self._header_display.content = header
-        self._body_display.content = body
-        self._disable_buttons()
-        await interaction.message.edit(view=self)
-        await interaction.followup.send(followup, ephemeral=True)
-
-    def _build_sync_button(self) -> ui.Button:
-        button = ui.Button(label="Sync Now", style=discord.ButtonStyle.success)
-        button.callback = self._on_approve  # type: ignore[assignment]
-        self._buttons.append(button)
-        return button
-
-    def _build_decline_button(self) -> ui.Button:
-        button = ui.Button(label="Not Now", style=discord.ButtonStyle.danger)
-        button.callback = self._on_deny  # type: ignore[assignment]
-        self._buttons.append(button)
-        return button
-
-    async def _on_approve(self, interaction: discord.Interaction) -> None:
-        if not self._has_permission(interaction):
+        item: ui.Button,
+        match: re.Match[str],
+    ) -> "InviteDecisionButton":
+        return cls(match["action"], int(match["guild_id"]))
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.guild is None or interaction.guild.id != self.guild_id:
             await interaction.response.send_message(
-                "You need the Manage Server permission to enable command synchronization.",
+                "This sync invitation belongs to a different server.",
                 ephemeral=True,
             )
+            return False
+
+        member = interaction.user
+        if isinstance(member, discord.Member) and member.guild_permissions.manage_guild:
+            return True
+
+        verb = "enable command synchronization" if self.action == "approve" else "dismiss this notification"
+        await interaction.response.send_message(
+            f"You need the Manage Server permission to {verb}.",
+            ephemeral=True,
+        )
+        return False
+
+    async def callback(self, interaction: discord.Interaction) -> None:
+        engine = _resolve_engine(interaction)
+        if engine is None:
+            await interaction.response.send_message("Guild sync is not loaded right now.", ephemeral=True)
             return
 
         await interaction.response.defer(ephemeral=True, thinking=False)
+        if self.action == "approve":
+            await self._approve(interaction, engine)
+        else:
+            await self._decline(interaction, engine)
 
-        success = await self.engine.add_guild(
-            self.guild.id,
-            alias=self.guild.name,
+    async def _approve(self, interaction: discord.Interaction, engine: GuildSyncEngine) -> None:
+        guild = interaction.guild
+        success = await engine.add_guild(
+            self.guild_id,
+            alias=guild.name if guild is not None else None,
             persist=True,
             overwrite=False,
         )
 
         if success:
-            self.engine.mark_invite_complete(self.guild.id)
-            await self._finalize(
+            await _finalize(
                 interaction,
+                self.guild_id,
                 header="### Sync Enabled ✅",
                 body="Commands are now syncing for this guild.",
                 followup="Sync registered and commands will begin propagating shortly.",
@@ -102,21 +102,52 @@ class GuildSyncInviteView(ui.LayoutView):
                 ephemeral=True,
             )
 
-    async def _on_deny(self, interaction: discord.Interaction) -> None:
-        if not self._has_permission(interaction):
-            await interaction.response.send_message(
-                "You need the Manage Server permission to dismiss this notification.",
-                ephemeral=True,
-            )
-            return
-
-        await interaction.response.defer(ephemeral=True, thinking=False)
-
-        suppress_guild(self.guild.id)
-        self.engine.mark_invite_complete(self.guild.id)
-        await self._finalize(
+    async def _decline(self, interaction: discord.Interaction, engine: GuildSyncEngine) -> None:
+        suppress_guild(self.guild_id)
+        engine.mark_invite_complete(self.guild_id)
+        await _finalize(
             interaction,
+            self.guild_id,
             header="### Sync Invitation Dismissed",
             body="We will remain quiet until synchronization is manually enabled.",
             followup="Understood. We will not send further sync invitations for this guild.",
-        )
\ No newline at end of file
+        )
+
+
+async def _finalize(
+    interaction: discord.Interaction,
+    guild_id: int,
+    *,
+    header: str,
+    body: str,
+    followup: str,
+) -> None:
+    if interaction.message is not None:
+        await interaction.message.edit(view=GuildSyncInviteView(guild_id, header=header, body=body, disabled=True))
+    await interaction.followup.send(followup, ephemeral=True)
+
+
+class GuildSyncInviteView(ui.LayoutView):
+    def __init__(
+        self,
+        guild_id: int,
+        *,
+        header: str = "### Ready to Sync Commands",
+        body: str = (
+            "This bot is currently not synchronizing commands for this guild. "
+            "If you have the Manage Server permission you can opt in or dismiss this notice."
+        ),
+        disabled: bool = False,
+    ) -> None:
+        super().__init__(timeout=None)
+
+        container = ui.Container(accent_color=discord.Color.blurple())
+        container.add_item(ui.TextDisplay(header))
+        container.add_item(ui.TextDisplay(body))
+
+        button_row = ui.ActionRow()
+        button_row.add_item(InviteDecisionButton("approve", guild_id, disabled=disabled))
+        button_row.add_item(InviteDecisionButton("decline", guild_id, disabled=disabled))
+        container.add_item(button_row)
+
+        self.add_item(container)
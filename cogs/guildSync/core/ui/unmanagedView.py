@@ -0,0 +1,52 @@
+import discord
+from discord import ui
+from typing import List, Optional, Set
+
+
+class UnmanagedGuildsContainer(ui.LayoutView):
+    def __init__(
+        self,
+        guilds: List[discord.Guild],
+        client: discord.Client,
+        *,
+        page: int,
+        pages: int,
+        total: int,
+        suppressed: Optional[Set[int]] = None,
+    ) -> None:
+        super().__init__(timeout=None)
+        self.client = client
+        suppressed = suppressed or set()
+
+        header = ui.TextDisplay("### SyncEngine - Unmanaged Guilds 🛰️")
+        if not guilds:
+            body_lines = [
+                "**Unmanaged Guilds**",
+                "⤷ The bot is not in any guild missing from the config." if total == 0 else "⤷ This page is empty.",
+            ]
+        else:
+            body_lines = [
+                f"**Unmanaged Guilds** – page {page}/{pages} ({total} total)",
+            ]
+            for guild in guilds:
+                line = f"> **⤷** *{guild.name}* (`{guild.id}`)"
+                member_count = getattr(guild, "member_count", None)
+                if member_count is not None:
+                    line += f" – {member_count} members"
+                if guild.id in suppressed:
+                    line += " – prompt declined"
+                body_lines.append(line)
+
+        body_text = ui.TextDisplay("\n".join(body_lines))
+
+        section_kwargs = {}
+        bot_user = getattr(self.client, "user", None)
+        avatar_asset = getattr(bot_user.display_avatar, "url", None) if bot_user else None
+        if avatar_asset:
+            section_kwargs["accessory"] = ui.Thumbnail(media=avatar_asset)
+
+        section = ui.Section(header, body_text, **section_kwargs)
+        container_view = ui.Container(accent_color=discord.Color.blurple())
+        container_view.add_item(section)
+
+        self.add_item(container_view)
@@ -1,16 +1,17 @@
 import discord
 from discord import ui
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
 # from .buttons import ReSyncButton
 
 class ViewSyncedContainer(ui.LayoutView):
     def __init__(
         self,
-        synced_guild: Dict[int, discord.Guild],
+        synced_guild: Mapping[int, Any],
         client: discord.Client,
         guild_commands: Optional[Dict[int, List[str]]] = None,
         disabled_groups: Optional[Dict[int, List[str]]] = None,
+        payload_stats: Optional[Tuple[int, int]] = None,
     ) -> None:
         super().__init__(timeout=None)
         self.client = client
@@ -31,6 +32,11 @@ class ViewSyncedContainer(ui.LayoutView):
             for guild_id, guild in sorted(synced_guild.items(), key=lambda item: item[1].name.lower()):
                 body_lines.append(f"> **⤷** *{guild.name}* (`{guild_id}`)")
 
+                last_synced_at = getattr(guild, "last_synced_at", None)
+                if last_synced_at is not None:
+                    outcome = "ok" if getattr(guild, "last_sync_ok", False) else "failed"
+                    body_lines.append(f">    • Last sync: <t:{int(last_synced_at)}:R> ({outcome})")
+
                 commands = self.guild_commands.get(guild_id, [])
                 if commands:
                     for command in commands:
@@ -43,6 +49,18 @@ class ViewSyncedContainer(ui.LayoutView):
                     disabled_list = ", ".join(disabled)
                     body_lines.append(f">    • Disabled groups: {disabled_list}")
 
+        if payload_stats is not None:
+            skipped, pushed = payload_stats
+            checked = skipped + pushed
+            body_lines.append("")
+            body_lines.append("**Payload Cache**")
+            if checked:
+                body_lines.append(
+                    f"> **⤷** {skipped} skipped / {pushed} pushed ({skipped / checked:.0%} hit rate)"
+                )
+            else:
+                body_lines.append("> **⤷** No guild syncs recorded yet.")
+
         body_text = ui.TextDisplay("\n".join(body_lines))
 
         section_kwargs = {}
@@ -2,25 +2,39 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 import asyncio
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 from interface.logger import Logger
 
 from cogs.guildSync.core.engine.syncCommands.main import SyncCommandsEngine
 from cogs.guildSync.core.engine.syncGuilds.main import GuildSyncEngine
 from cogs.guildSync.core.engine.syncCog import SyncCogEngine
+from cogs.guildSync.core.engine.syncWatcher import ConfigWatcher
+from cogs.guildSync.core.engine.syncDrift import DriftDetector
+from cogs.guildSync.core.engine.autocomplete import AutocompleteEngine, AutocompleteIndex, Candidate
+from cogs.guildSync.core.engine.syncCommands.modules.reconcile import DRIFTED, MISSING
 
 from interface.commands import sync_group, sync_cog_group, sync_command_group
+from cogs.guildSync.core.ui.inviteView import InviteDecisionButton
 from cogs.guildSync.core.ui.notificationView import (
     create_success_container,
     create_error_container,
 )
 from cogs.guildSync.core.config.lib import (
+    clear_sync_hash,
+    close_config_store,
+    compact_journal,
     disable_command_for_guild,
     disable_command_globally,
     enable_command_for_guild,
     enable_command_globally,
+    export_json_snapshots,
+    flush_sync_hashes,
     get_command_scope,
+    get_setting,
+    is_guild_suppressed,
+    scope_transaction,
+    storage_backend,
 )
 
 REQUIRED_VERSION = (2, 3, 0)
@@ -51,9 +65,81 @@ class GuildSyncCog(commands.Cog):
         self.sync_guilds_engine = GuildSyncEngine(bot)
         self.sync_guilds_engine.attach_commands_engine(self.sync_commands_engine)
         self.sync_cog_engine = SyncCogEngine(bot, self.sync_guilds_engine, self.sync_commands_engine)
+        self.config_watcher = ConfigWatcher(bot, self.sync_guilds_engine, self.sync_commands_engine)
+        self.drift_detector = DriftDetector(self.sync_guilds_engine, self.sync_commands_engine)
+        self.autocomplete = AutocompleteEngine()
 
     async def cog_load(self) -> None:
+        # Registered here rather than in setup_hook so a reload swaps in the freshly imported class.
+        self.bot.add_dynamic_items(InviteDecisionButton)
         asyncio.create_task(self._sync_on_ready())
+        self._compaction_task = asyncio.create_task(self._compact_config_periodically())
+
+    async def cog_unload(self) -> None:
+        self.bot.remove_dynamic_items(InviteDecisionButton)
+        self._compaction_task.cancel()
+        await self.config_watcher.stop()
+        await self.drift_detector.stop()
+        await self.sync_guilds_engine.invites.stop()
+        await self.sync_commands_engine.shutdown()
+        if storage_backend() == "sqlite":
+            # Keep the JSON files as a readable export of the database.
+            await export_json_snapshots()
+        else:
+            await compact_journal()
+        await close_config_store()
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild: discord.Guild) -> None:
+        await self.sync_guilds_engine.handle_guild_available(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild: discord.Guild) -> None:
+        await self.sync_guilds_engine.handle_guild_available(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild: discord.Guild) -> None:
+        self.sync_guilds_engine.handle_guild_remove(guild)
+
+    # Anything that can change which channel the bot may prompt in drops that guild's cached choice.
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel: discord.abc.GuildChannel) -> None:
+        self.sync_guilds_engine.invalidate_notification_channel(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_update(self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel) -> None:
+        self.sync_guilds_engine.invalidate_notification_channel(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self.sync_guilds_engine.invalidate_notification_channel(channel.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_update(self, before: discord.Guild, after: discord.Guild) -> None:
+        self.sync_guilds_engine.invalidate_notification_channel(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before: discord.Role, after: discord.Role) -> None:
+        self.sync_guilds_engine.invalidate_notification_channel(after.guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        self.sync_guilds_engine.invalidate_notification_channel(role.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_update(self, before: discord.Member, after: discord.Member) -> None:
+        if self.bot.user is not None and after.id == self.bot.user.id and before.roles != after.roles:
+            self.sync_guilds_engine.invalidate_notification_channel(after.guild.id)
+
+    async def _compact_config_periodically(self) -> None:
+        interval = max(1.0, float(get_setting("journal_compact_interval_seconds")))
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if await compact_journal():
+                    Logger.info("GuildSyncCog -", "Compacted config journal into JSON snapshots.")
+            except OSError as exc:
+                Logger.error("GuildSyncCog -", f"Failed to compact config journal: {exc}")
 
     async def _sync_on_ready(self) -> None:
         await self.bot.wait_until_ready()
@@ -76,6 +162,9 @@ class GuildSyncCog(commands.Cog):
                 removed_guilds = [guild for guild in self.bot.guilds if guild.id in removed_ids]
                 await self.sync_commands_engine.desync_commands(removed_guilds)
 
+        self.config_watcher.start()
+        self.drift_detector.start()
+
 @sync_group.command(name="view", description="Show cached synced guilds.")
 async def show_synced_guilds(interaction: discord.Interaction) -> None:
     await interaction.response.defer(ephemeral=True)
@@ -89,16 +178,91 @@ async def show_synced_guilds(interaction: discord.Interaction) -> None:
     synced_guilds = guild_sync_cog.sync_guilds_engine.synced_guilds
     command_snapshot = guild_sync_cog.sync_commands_engine.get_guild_commands()
     disabled_groups = guild_sync_cog.sync_commands_engine.get_disabled_groups()
+    payload_stats = guild_sync_cog.sync_commands_engine.get_payload_stats()
     from cogs.guildSync.core.ui.viewSyncedView import ViewSyncedContainer
     view = ViewSyncedContainer(
         synced_guild=synced_guilds,
         client=interaction.client,
         guild_commands=command_snapshot,
         disabled_groups=disabled_groups,
+        payload_stats=payload_stats,
     )
     await interaction.followup.send(view=view, ephemeral=True)
 
 
+_UNMANAGED_PAGE_SIZE = 20
+
+
+@sync_group.command(name="unmanaged", description="List guilds the bot is in that are not in the config.")
+@app_commands.describe(page="Page number, 20 guilds per page")
+async def show_unmanaged_guilds(interaction: discord.Interaction, page: app_commands.Range[int, 1] = 1) -> None:
+    if not _ensure_admin(interaction):
+        await interaction.response.send_message(
+            view=_error_view("You must run this command inside a guild with administrator permissions."),
+            ephemeral=True,
+        )
+        return
+
+    guild_sync_cog = interaction.client.get_cog("GuildSyncCog")
+    if not isinstance(guild_sync_cog, GuildSyncCog):
+        await interaction.response.send_message(
+            view=_error_view("Guild sync cog is not loaded."),
+            ephemeral=True,
+        )
+        return
+
+    guilds, total = guild_sync_cog.sync_guilds_engine.get_unmanaged_page(page, _UNMANAGED_PAGE_SIZE)
+    pages = max(1, -(-total // _UNMANAGED_PAGE_SIZE))
+    from cogs.guildSync.core.ui.unmanagedView import UnmanagedGuildsContainer
+    view = UnmanagedGuildsContainer(
+        guilds,
+        interaction.client,
+        page=page,
+        pages=pages,
+        total=total,
+        suppressed={guild.id for guild in guilds if is_guild_suppressed(guild.id)},
+    )
+    await interaction.response.send_message(view=view, ephemeral=True)
+
+
+@sync_group.command(name="status", description="Show queued and recent command resyncs.")
+@app_commands.describe(ticket="Ticket number returned by an enable/disable command")
+async def show_sync_status(interaction: discord.Interaction, ticket: Optional[int] = None) -> None:
+    guild_sync_cog = interaction.client.get_cog("GuildSyncCog")
+    if not isinstance(guild_sync_cog, GuildSyncCog):
+        await interaction.response.send_message(
+            view=_error_view("Guild sync cog is not loaded."),
+            ephemeral=True,
+        )
+        return
+
+    scheduler = guild_sync_cog.sync_commands_engine.scheduler
+    if ticket is not None:
+        entry = scheduler.get_ticket(ticket)
+        if entry is None:
+            await interaction.response.send_message(
+                view=_error_view(f"Ticket #{ticket} is unknown or has expired."),
+                ephemeral=True,
+            )
+            return
+        tickets = [entry]
+    else:
+        tickets = scheduler.recent_tickets()[:10]
+
+    lines = [f"Guilds waiting for the next resync: {len(scheduler.pending_guild_ids())}."]
+    for entry in tickets:
+        line = f"• Ticket #{entry.id}: {entry.status} ({len(entry.guild_ids)} guilds)"
+        if entry.error:
+            line += f" – {entry.error}"
+        lines.append(line)
+
+    await interaction.response.send_message(view=_success_view("\n".join(lines)), ephemeral=True)
+
+
+def _choices(candidates: List[Candidate]) -> List[app_commands.Choice[str]]:
+    return [app_commands.Choice(name=candidate.label[:100], value=candidate.value) for candidate in candidates]
+
+
 async def _command_key_autocomplete(
     interaction: discord.Interaction,
     current: str,
@@ -107,19 +271,14 @@ async def _command_key_autocomplete(
     if not isinstance(guild_sync_cog, GuildSyncCog):
         return []
 
-    entries = guild_sync_cog.sync_commands_engine.list_available_command_keys()
-    current_lower = current.lower()
-    choices: List[app_commands.Choice[str]] = []
+    key_index = guild_sync_cog.sync_commands_engine.get_command_key_index()
 
-    for key, label in entries:
-        display = f"{label} ({key})"
-        if current_lower and current_lower not in display.lower():
-            continue
-        choices.append(app_commands.Choice(name=display[:100], value=key))
-        if len(choices) >= 25:
-            break
+    def build() -> AutocompleteIndex:
+        return AutocompleteIndex(Candidate(entry.key, entry.display) for entry in key_index.entries)
 
-    return choices
+    # The key index is rebuilt whenever extensions change, so it doubles as the version.
+    results = guild_sync_cog.autocomplete.complete(interaction.user.id, "command_keys", key_index, build, current)
+    return _choices(results)
 
 
 async def _guild_target_autocomplete(
@@ -130,36 +289,43 @@ async def _guild_target_autocomplete(
     if not isinstance(guild_sync_cog, GuildSyncCog):
         return []
 
-    synced = guild_sync_cog.sync_guilds_engine.get_synced_guilds()
-    current_lower = current.lower()
-    choices: List[app_commands.Choice[str]] = []
+    guild_engine = guild_sync_cog.sync_guilds_engine
 
-    if not current or "global".startswith(current_lower):
-        choices.append(app_commands.Choice(name="All guilds", value="global"))
+    def build() -> AutocompleteIndex:
+        synced = guild_engine.get_synced_guilds()
+        return AutocompleteIndex(
+            Candidate(str(guild_id), f"{guild.name} ({guild_id})")
+            for guild_id, guild in sorted(synced.items(), key=lambda item: item[1].name.lower())
+        )
 
-    for guild_id, guild in sorted(synced.items(), key=lambda item: item[1].name.lower()):
-        display = f"{guild.name} ({guild_id})"
-        if current_lower and current_lower not in display.lower():
-            continue
-        choices.append(app_commands.Choice(name=display[:100], value=str(guild_id)))
-        if len(choices) >= 25:
-            break
+    choices: List[app_commands.Choice[str]] = []
+    if not current or "global".startswith(current.lower()):
+        choices.append(app_commands.Choice(name="All guilds", value="global"))
 
-    return choices
+    results = guild_sync_cog.autocomplete.complete(
+        interaction.user.id,
+        "guilds",
+        guild_engine.state.generation,
+        build,
+        current,
+        AutocompleteEngine.MAX_CHOICES - len(choices),
+    )
+    return choices + _choices(results)
 
 
-def _extension_choice_values(entries: List[str], current: str) -> List[app_commands.Choice[str]]:
-    current_lower = current.lower()
-    choices: List[app_commands.Choice[str]] = []
+def _extension_choice_values(
+    guild_sync_cog: "GuildSyncCog",
+    interaction: discord.Interaction,
+    name: str,
+    entries: List[str],
+    current: str,
+) -> List[app_commands.Choice[str]]:
+    version = tuple(entries)
 
-    for name in entries:
-        if current_lower and current_lower not in name.lower():
-            continue
-        choices.append(app_commands.Choice(name=name[:100], value=name))
-        if len(choices) >= 25:
-            break
+    def build() -> AutocompleteIndex:
+        return AutocompleteIndex(Candidate(entry, entry) for entry in version)
 
-    return choices
+    return _choices(guild_sync_cog.autocomplete.complete(interaction.user.id, name, version, build, current))
 
 
 async def _loaded_extension_autocomplete(
@@ -171,7 +337,7 @@ async def _loaded_extension_autocomplete(
         return []
 
     entries = guild_sync_cog.sync_cog_engine.list_loaded_extensions()
-    return _extension_choice_values(entries, current)
+    return _extension_choice_values(guild_sync_cog, interaction, "loaded_extensions", entries, current)
 
 
 async def _available_extension_autocomplete(
@@ -186,7 +352,7 @@ async def _available_extension_autocomplete(
     entries = engine.list_unloaded_extensions()
     if not entries:
         entries = engine.list_known_extensions()
-    return _extension_choice_values(entries, current)
+    return _extension_choice_values(guild_sync_cog, interaction, "available_extensions", entries, current)
 
 
 def _ensure_admin(interaction: discord.Interaction) -> bool:
@@ -200,17 +366,17 @@ def _resolve_target_guilds(
     guild_sync_cog: GuildSyncCog,
     target_value: str,
 ) -> Dict[int, discord.Guild]:
-    synced = guild_sync_cog.sync_guilds_engine.get_synced_guilds()
+    guild_engine = guild_sync_cog.sync_guilds_engine
 
     if target_value == "global":
-        return synced
+        return guild_engine.resolve_guilds()
 
     try:
         target_id = int(target_value)
     except ValueError:
         return {}
 
-    target_guild = synced.get(target_id) or guild_sync_cog.bot.get_guild(target_id)
+    target_guild = guild_engine.resolve_guild(target_id) or guild_sync_cog.bot.get_guild(target_id)
     return {target_id: target_guild} if target_guild else {}
 
 
@@ -249,7 +415,71 @@ def _build_scope_summary(command_keys: List[str]) -> str:
     return f"Updated {len(command_keys)} commands. Scopes include: {scope_list}."
 
 
-@sync_command_group.command(name="disable", description="Disable a synced command and resync immediately.")
+_AUDIT_LIST_LIMIT = 15
+
+
+@sync_group.command(name="audit", description="Compare the commands registered on Discord with the local config.")
+@app_commands.describe(
+    target_guild="Guild to audit, or all guilds",
+    repair="Queue a resync for every guild that is drifted or missing",
+)
+@app_commands.autocomplete(target_guild=_guild_target_autocomplete)
+async def audit_commands(interaction: discord.Interaction, target_guild: str = "global", repair: bool = False) -> None:
+    if not _ensure_admin(interaction):
+        await interaction.response.send_message(
+            view=_error_view("You must run this command inside a guild with administrator permissions."),
+            ephemeral=True,
+        )
+        return
+
+    await interaction.response.defer(ephemeral=True)
+
+    guild_sync_cog = interaction.client.get_cog("GuildSyncCog")
+    if not isinstance(guild_sync_cog, GuildSyncCog):
+        await interaction.followup.send(view=_error_view("Guild sync cog is not loaded."), ephemeral=True)
+        return
+
+    target_map = _resolve_target_guilds(guild_sync_cog, target_guild)
+    if not target_map:
+        await interaction.followup.send(view=_error_view("Unable to resolve the selected guild."), ephemeral=True)
+        return
+
+    engine = guild_sync_cog.sync_commands_engine
+    results = await engine.audit_guilds(list(target_map))
+    counts: Dict[str, int] = {}
+    for result in results.values():
+        counts[result.status] = counts.get(result.status, 0) + 1
+
+    lines = [
+        f"Audited {len(results)} guilds: "
+        + ", ".join(f"{count} {status.replace('_', ' ')}" for status, count in sorted(counts.items()))
+        + "."
+    ]
+    if target_guild == "global":
+        global_result = await engine.audit_global()
+        lines.append(f"Global commands: {global_result.status.replace('_', ' ')}.")
+
+    out_of_sync = {guild_id: result for guild_id, result in results.items() if result.status in (DRIFTED, MISSING)}
+    for guild_id, result in list(out_of_sync.items())[:_AUDIT_LIST_LIMIT]:
+        guild = target_map[guild_id]
+        differences = (("missing", result.missing), ("unexpected", result.unexpected), ("changed", result.changed))
+        details = [f"{label}: {', '.join(names)}" for label, names in differences if names]
+        lines.append(f"• {guild.name} ({guild_id}) – {result.status} ({'; '.join(details)})")
+    if len(out_of_sync) > _AUDIT_LIST_LIMIT:
+        lines.append(f"…and {len(out_of_sync) - _AUDIT_LIST_LIMIT} more.")
+
+    if repair and out_of_sync:
+        # The stored hashes claim these guilds are current, so drop them to force a push.
+        for guild_id in out_of_sync:
+            clear_sync_hash(guild_id)
+        flush_sync_hashes()
+        ticket = engine.schedule_sync({guild_id: target_map[guild_id] for guild_id in out_of_sync})
+        lines.append(f"Resync queued as ticket #{ticket.id}; check `/sync status`.")
+
+    await interaction.followup.send(view=_success_view("\n".join(lines)), ephemeral=True)
+
+
+@sync_command_group.command(name="disable", description="Disable a synced command and queue a resync.")
 @app_commands.describe(
     command_key="Command to disable (e.g. sync.synced)",
     target_guild="Select the guild to apply the change to or choose all guilds",
@@ -311,14 +541,15 @@ async def disable_command(
     target_id = None if target_guild == "global" else next(iter(target_map))
 
     changed_keys: List[str] = []
-    for resolved_key in expanded_keys:
-        if target_guild == "global":
-            if disable_command_globally(resolved_key):
-                changed_keys.append(resolved_key)
-        else:
-            assert target_id is not None
-            if disable_command_for_guild(resolved_key, target_id):
-                changed_keys.append(resolved_key)
+    async with scope_transaction():
+        for resolved_key in expanded_keys:
+            if target_guild == "global":
+                if disable_command_globally(resolved_key):
+                    changed_keys.append(resolved_key)
+            else:
+                assert target_id is not None
+                if disable_command_for_guild(resolved_key, target_id):
+                    changed_keys.append(resolved_key)
 
     if not changed_keys:
         await interaction.followup.send(
@@ -327,24 +558,23 @@ async def disable_command(
         )
         return
 
-    await guild_sync_cog.sync_commands_engine.sync_selected_guilds(
+    ticket = guild_sync_cog.sync_commands_engine.schedule_sync(
         target_map,
         clear_global=(target_guild == "global"),
         reset_snapshots=(target_guild == "global"),
-        include_progress=False,
-        progress_callback=None,
     )
 
     scope_summary = _build_scope_summary(changed_keys)
     await interaction.followup.send(
         view=_success_view(
-            f"Disabled `{selection_display}` for {target_label}. {scope_summary}"
+            f"Disabled `{selection_display}` for {target_label}. {scope_summary} "
+            f"Resync queued as ticket #{ticket.id}; check `/sync status`."
         ),
         ephemeral=True,
     )
 
 
-@sync_command_group.command(name="enable", description="Enable a previously disabled command and resync.")
+@sync_command_group.command(name="enable", description="Enable a previously disabled command and queue a resync.")
 @app_commands.describe(
     command_key="Command to enable (e.g. sync.synced)",
     target_guild="Select the guild to apply the change to or choose all guilds",
@@ -399,14 +629,15 @@ async def enable_command(
     target_id = None if target_guild == "global" else next(iter(target_map))
 
     changed_keys: List[str] = []
-    for resolved_key in expanded_keys:
-        if target_guild == "global":
-            if enable_command_globally(resolved_key):
-                changed_keys.append(resolved_key)
-        else:
-            assert target_id is not None
-            if enable_command_for_guild(resolved_key, target_id):
-                changed_keys.append(resolved_key)
+    async with scope_transaction():
+        for resolved_key in expanded_keys:
+            if target_guild == "global":
+                if enable_command_globally(resolved_key):
+                    changed_keys.append(resolved_key)
+            else:
+                assert target_id is not None
+                if enable_command_for_guild(resolved_key, target_id):
+                    changed_keys.append(resolved_key)
 
     if not changed_keys:
         await interaction.followup.send(
@@ -415,18 +646,17 @@ async def enable_command(
         )
         return
 
-    await guild_sync_cog.sync_commands_engine.sync_selected_guilds(
+    ticket = guild_sync_cog.sync_commands_engine.schedule_sync(
         target_map,
         clear_global=(target_guild == "global"),
         reset_snapshots=(target_guild == "global"),
-        include_progress=False,
-        progress_callback=None,
     )
 
     scope_summary = _build_scope_summary(changed_keys)
     await interaction.followup.send(
         view=_success_view(
-            f"Enabled `{selection_display}` for {target_label}. {scope_summary}"
+            f"Enabled `{selection_display}` for {target_label}. {scope_summary} "
+            f"Resync queued as ticket #{ticket.id}; check `/sync status`."
         ),
         ephemeral=True,
     )
@@ -0,0 +1,35 @@
+import asyncio
+
+import discord
+from discord.ext import commands
+
+from cogs.guildSync.core.engine.syncCommands.modules import sync as sync_module
+from cogs.guildSync.core.engine.syncCommands.main import SyncCommandsEngine
+from interface.commands import debug_group
+
+
+def test_extension_loaded_after_guildsync_gets_scope_check(monkeypatch):
+    real_get_setting = sync_module.get_setting
+    monkeypatch.setattr(
+        sync_module,
+        "get_setting",
+        lambda key: True if key == "stateless_dispatch" else real_get_setting(key),
+    )
+
+    async def scenario() -> None:
+        bot = commands.Bot(command_prefix="!", intents=discord.Intents.none())
+        engine = SyncCommandsEngine(bot)
+        dispatch = engine.synchroniser.dispatch
+        assert dispatch.installed
+
+        await bot.load_extension("cogs.debug")
+        try:
+            await engine.sync_selected_guilds({})
+            leaves = list(engine.cloner.iter_group_commands(debug_group))
+            assert {leaf.name for leaf in leaves} >= {"ping", "drift"}
+            assert all(dispatch._check in leaf.checks for leaf in leaves)
+        finally:
+            await bot.unload_extension("cogs.debug")
+            dispatch.uninstall()
+
+    asyncio.run(scenario())